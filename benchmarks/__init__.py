@@ -0,0 +1,3 @@
+"""
+Benchmarks on synthetic inputs; run with `python -m benchmarks.run`.
+"""
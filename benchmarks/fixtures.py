@@ -0,0 +1,169 @@
+import logging
+import os
+import wave
+
+import numpy as np
+from PIL import Image
+
+from pipeline.transcript_cache import save_segments, transcript_key
+
+logger = logging.getLogger(__name__)
+
+# (width, height) of generated images: landscape, portrait, square and panorama shots,
+# so resize_image exercises both letterbox and pillarbox paths
+IMAGE_SIZES = [
+    (1920, 1080),
+    (1280, 960),
+    (1080, 1920),
+    (1200, 1200),
+    (2560, 1080),
+    (3000, 2000),
+    (800, 1200),
+]
+
+_WORDS = (
+    "the match was close until the final over when the crowd stood up and the "
+    "captain changed the field again while everyone watched the last ball"
+).split()
+
+
+def make_wav(path: str, seconds: float, sample_rate: int = 16000, seed: int = 0) -> str:
+    """
+    Write a deterministic speech-like mono 16-bit WAV: voiced "syllables" (a pitched
+    harmonic stack with a few formant peaks, ~4 per second) grouped into words and
+    sentences separated by pauses, over low background noise.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    out = rng.normal(0.0, 0.003, n)
+
+    t = 0.0
+    while t < seconds:
+        # one sentence: 3-12 words of 1-3 syllables, then a longer pause
+        for _ in range(int(rng.integers(3, 13))):
+            for _ in range(int(rng.integers(1, 4))):
+                length = float(rng.uniform(0.12, 0.30))
+                start, end = int(t * sample_rate), min(n, int((t + length) * sample_rate))
+                if start >= n:
+                    break
+                tt = np.arange(end - start) / sample_rate
+                f0 = float(rng.uniform(100.0, 220.0)) * (1.0 + 0.05 * np.sin(2 * np.pi * 3.0 * tt))
+                phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+                formants = rng.uniform(300.0, 3000.0, 3)
+                voiced = np.zeros_like(tt)
+                for h in range(1, 16):
+                    gain = sum(np.exp(-((h * f0 - f) / 150.0) ** 2) for f in formants) + 0.05 / h
+                    voiced += gain * np.sin(h * phase)
+                envelope = np.sin(np.pi * tt / length) ** 2
+                out[start:end] += 0.08 * envelope * voiced
+                t += length
+            t += float(rng.uniform(0.05, 0.2))
+        t += float(rng.uniform(0.4, 1.2))
+
+    pcm = (np.clip(out, -1.0, 1.0) * 32767).astype("<i2")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+    return path
+
+
+def make_images(folder: str, count: int, seed: int = 0) -> list[str]:
+    """
+    Write `count` deterministic PNGs cycling through IMAGE_SIZES. Content is a colour
+    gradient with blocks and noise, so PNG decode and x264 see photo-like entropy
+    rather than flat frames.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(count):
+        w, h = IMAGE_SIZES[i % len(IMAGE_SIZES)]
+        yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+        c0, c1 = rng.uniform(0, 255, 3), rng.uniform(0, 255, 3)
+        mix = ((xx / w + yy / h) / 2.0)[..., None]
+        img = c0 * (1.0 - mix) + c1 * mix
+        for _ in range(6):
+            x0, y0 = int(rng.integers(0, w)), int(rng.integers(0, h))
+            x1, y1 = x0 + int(rng.integers(w // 10, w // 3)), y0 + int(rng.integers(h // 10, h // 3))
+            img[y0:y1, x0:x1] = rng.uniform(0, 255, 3)
+        img += rng.normal(0.0, 12.0, img.shape)
+        path = os.path.join(folder, f"{i + 1:03d}.png")
+        Image.fromarray(np.clip(img, 0, 255).astype(np.uint8)).save(path)
+        paths.append(path)
+    return paths
+
+
+def synthetic_segments(seconds: float, seed: int = 0) -> list[dict]:
+    """
+    Whisper-style segments (2-6 s, short gaps) covering the audio, with word timings.
+    """
+    rng = np.random.default_rng(seed)
+    segments = []
+    t = float(rng.uniform(0.0, 0.5))
+    while t < seconds - 0.5:
+        end = min(seconds, t + float(rng.uniform(2.0, 6.0)))
+        count = max(1, int((end - t) * 2.5))
+        words = [str(_WORDS[int(j)]) for j in rng.integers(0, len(_WORDS), count)]
+        step = (end - t) / count
+        segments.append({
+            "start": round(t, 2),
+            "end": round(end, 2),
+            "text": " " + " ".join(words),
+            "words": [
+                {"start": round(t + k * step, 2), "end": round(t + (k + 1) * step, 2), "word": " " + w}
+                for k, w in enumerate(words)
+            ],
+        })
+        t = end + float(rng.uniform(0.1, 0.8))
+    return segments
+
+
+def seed_transcript(
+    cache_dir: str,
+    audio_path: str,
+    segments: list[dict],
+    model_size: str = "base",
+    translate: bool = True,
+    backend: str = "faster",
+) -> str:
+    """
+    Store segments in the transcript cache under the key generate_video will look up,
+    so benchmarks never load Whisper. Returns the key.
+    """
+    task = "translate" if translate else "transcribe"
+    key = transcript_key(audio_path, model_size, task, None, backend)
+    save_segments(cache_dir, key, segments, meta={"audio": os.path.basename(audio_path), "synthetic": True})
+    return key
+
+
+def build_fixtures(root: str, seconds: float, images: int, seed: int = 0) -> dict:
+    """
+    Generate (or reuse) the fixture set for these parameters under root:
+    {"dir", "audio", "images", "segments", "seconds"}.
+    """
+    folder = os.path.abspath(os.path.join(root, f"a{seconds:g}s_i{images}_s{seed}"))
+    audio = os.path.join(folder, "audio.wav")
+    image_dir = os.path.join(folder, "images")
+
+    if not os.path.isfile(audio):
+        logger.info("Generating synthetic audio %.1fs: %s", seconds, audio)
+        make_wav(audio, seconds, seed=seed)
+    existing = sorted(f for f in os.listdir(image_dir) if f.endswith(".png")) if os.path.isdir(image_dir) else []
+    if len(existing) != images:
+        logger.info("Generating %d synthetic images: %s", images, image_dir)
+        for f in existing:
+            os.remove(os.path.join(image_dir, f))
+        image_paths = make_images(image_dir, images, seed=seed)
+    else:
+        image_paths = [os.path.join(image_dir, f) for f in existing]
+
+    return {
+        "dir": folder,
+        "audio": audio,
+        "images": image_paths,
+        "segments": synthetic_segments(seconds, seed=seed),
+        "seconds": float(seconds),
+    }
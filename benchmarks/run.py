@@ -0,0 +1,456 @@
+"""
+Pipeline benchmarks on deterministic synthetic inputs (no network, GPU or Whisper model:
+the transcript cache is seeded with synthetic segments).
+
+    python -m benchmarks.run                        # everything, 20 s audio, 8 images
+    python -m benchmarks.run --seconds 60 --images 20 --only video/ffmpeg
+    python -m benchmarks.run --compare .cache/benchmarks/results/bench_<old>.json
+    python -m benchmarks.run --seconds 60 --only memory/   # slideshow peak RSS, 50 vs 500 images
+
+Prints a comparison table and writes the results as JSON (.cache/benchmarks/results/ by
+default) so throughput can be tracked across versions.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from config import FPS, RENDER_PROFILES
+from pipeline.image_utils import resize_image
+from pipeline.subtitle_utils import _format_timestamp, _to_ass
+from pipeline.video_generator import generate_video
+from pipeline.shorts_creator import create_shorts
+from utils.logger import setup_logging
+from utils.timing import RunReport, stage
+
+from .fixtures import build_fixtures, seed_transcript
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(".cache", "benchmarks", "results")
+FIXTURES_DIR = os.path.join(".cache", "benchmarks")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budgets (seconds per run) for the startup cases; a case over budget fails
+HELP_BUDGET_S = 0.6
+CACHE_HIT_BUDGET_S = 1.0
+# Must stay unimported when no model is needed (transcript cache hit, ffmpeg engine)
+HEAVY_MODULES = ("torch", "whisper", "faster_whisper", "ctranslate2", "moviepy")
+
+_CACHE_HIT_SCRIPT = """
+import json, sys
+import main
+from pipeline.subtitle_utils import transcribe_audio_to_ass
+transcribe_audio_to_ass(sys.argv[1], sys.argv[2], model_size="base", translate=True,
+                        cache_dir=sys.argv[3], backend="faster")
+print(json.dumps(sorted(m for m in sys.argv[4].split(",") if m in sys.modules)))
+"""
+
+# Fresh interpreter per slideshow case, so its peak RSS is not inherited from earlier
+# cases. Peak RSS comes from the run report's sampler: ru_maxrss survives exec on Linux
+# and would report this (parent) process's peak.
+_SLIDESHOW_SCRIPT = """
+import json, sys
+from pipeline.video_generator import generate_video
+from utils.timing import RunReport, stage
+options = json.loads(sys.argv[1])
+with RunReport(None), stage("slideshow") as rec:
+    generate_video(**dict(options, size=tuple(options["size"])))
+print(json.dumps({"peak_rss_mb": rec["peak_rss_mb"]}))
+"""
+
+
+class Case(NamedTuple):
+    """
+    One benchmark: fn(ctx) does the work and returns (items, media_seconds); throughput
+    is items/s and the realtime factor media_seconds/wall (0 = not applicable). A third
+    element, if returned, is a dict of measurements overriding the stage record's
+    (e.g. peak_rss_mb of a subprocess).
+    """
+    name: str
+    unit: str
+    options: dict
+    fn: Callable[[dict], tuple]
+
+
+def _git_version() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, timeout=10,
+            cwd=REPO_DIR,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# --- micro benchmarks -------------------------------------------------------
+
+def _bench_resize(ctx: dict) -> tuple:
+    n = 0
+    for _ in range(ctx["repeat"]):
+        for path in ctx["fixtures"]["images"]:
+            if resize_image(path, ctx["size"]) is None:
+                raise RuntimeError(f"resize_image failed: {path}")
+            n += 1
+    return n, 0.0
+
+
+def _bench_format_timestamp(ctx: dict) -> tuple:
+    n = 100_000 * ctx["repeat"]
+    for i in range(n):
+        _format_timestamp(i * 0.037)
+    return n, 0.0
+
+
+def _bench_to_ass(ctx: dict) -> tuple:
+    segments = ctx["fixtures"]["segments"]
+    rounds = max(1, 20_000 // max(1, len(segments))) * ctx["repeat"]
+    for _ in range(rounds):
+        _to_ass(segments, max_line_chars=42)
+    return rounds * len(segments), 0.0
+
+
+# --- startup ---------------------------------------------------------------
+
+def _python(args: List[str], ctx: dict) -> subprocess.CompletedProcess:
+    """
+    Run a fresh interpreter in the scratch dir with the repo importable.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (REPO_DIR, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run([sys.executable, *args], cwd=ctx["work"], env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"exit {proc.returncode}: {proc.stderr.strip()[-500:]}")
+    return proc
+
+
+def _check_budget(wall: float, runs: int, budget: float) -> None:
+    per_run = wall / runs
+    if per_run > budget:
+        raise RuntimeError(f"startup {per_run:.3f}s per run is over the {budget:.2f}s budget")
+
+
+def _bench_help(ctx: dict) -> tuple:
+    runs = 3 * ctx["repeat"]
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        _python([os.path.join(REPO_DIR, "main.py"), "--help"], ctx)
+    _check_budget(time.perf_counter() - t0, runs, HELP_BUDGET_S)
+    return runs, 0.0
+
+
+def _bench_cache_hit(ctx: dict) -> tuple:
+    fixtures = ctx["fixtures"]
+    runs = 3 * ctx["repeat"]
+    t0 = time.perf_counter()
+    for i in range(runs):
+        proc = _python([
+            "-c", _CACHE_HIT_SCRIPT, fixtures["audio"], os.path.join(ctx["work"], f"hit{i}.ass"),
+            ctx["transcripts"], ",".join(HEAVY_MODULES),
+        ], ctx)
+        heavy = json.loads(proc.stdout.strip().splitlines()[-1])
+        if heavy:
+            raise RuntimeError(f"cache-hit run imported {heavy}")
+    _check_budget(time.perf_counter() - t0, runs, CACHE_HIT_BUDGET_S)
+    return runs, 0.0
+
+
+# --- pipeline benchmarks ----------------------------------------------------
+
+def _video_case(**options) -> Callable[[dict], tuple]:
+    def run(ctx: dict) -> tuple:
+        fixtures = ctx["fixtures"]
+        work = tempfile.mkdtemp(prefix="video_", dir=ctx["work"])
+        out = os.path.join(work, "output.mp4")
+        generate_video(
+            fixtures["audio"],
+            fixtures["images"],
+            out,
+            subtitle_dir=os.path.join(work, "subtitles"),
+            model_size="base",
+            fps=ctx["fps"],
+            translate_subs=True,
+            transcript_cache_dir=ctx["transcripts"],
+            whisper_backend="faster",
+            workers=ctx["workers"],
+            encoders={"base": ctx["profile"]["base"], "burn": ctx["profile"]["burn"]},
+            size=ctx["size"],
+            **options,
+        )
+        return int(round(fixtures["seconds"] * ctx["fps"])), fixtures["seconds"]
+    return run
+
+
+def _source_video(ctx: dict) -> str:
+    """
+    Subtitled landscape video the shorts cases cut from (rendered once, untimed).
+    """
+    if "source" not in ctx:
+        work = tempfile.mkdtemp(prefix="source_", dir=ctx["work"])
+        out = os.path.join(work, "source.mp4")
+        logger.info("Rendering shorts source video: %s", out)
+        ctx["source"] = generate_video(
+            ctx["fixtures"]["audio"],
+            ctx["fixtures"]["images"],
+            out,
+            subtitle_dir=os.path.join(work, "subtitles"),
+            fps=ctx["fps"],
+            engine="ffmpeg",
+            transcript_cache_dir=ctx["transcripts"],
+            workers=ctx["workers"],
+            encoders={"base": ctx["profile"]["base"]},
+            size=ctx["size"],
+            shorts_plan={"short_len": ctx["short_len"], "count": ctx["short_count"], "gap": 0.0},
+        )
+    return ctx["source"]
+
+
+def _shorts_case(**options) -> Callable[[dict], tuple]:
+    def run(ctx: dict) -> tuple:
+        source = _source_video(ctx)
+        out_dir = tempfile.mkdtemp(prefix="shorts_", dir=ctx["work"])
+        written = create_shorts(
+            source,
+            shorts_dir=out_dir,
+            fps=ctx["fps"],
+            short_len=ctx["short_len"],
+            count=ctx["short_count"],
+            encoder=ctx["profile"]["shorts"],
+            **options,
+        )
+        if len(written) != ctx["short_count"]:
+            raise RuntimeError(f"expected {ctx['short_count']} shorts, got {len(written)}")
+        seconds = ctx["short_len"] * len(written)
+        return int(round(seconds * ctx["fps"])), seconds
+    return run
+
+
+def _slideshow_images(ctx: dict, count: int) -> List[str]:
+    """
+    `count` image paths cycling through the fixture images (symlinks, copies where
+    symlinks are unavailable).
+    """
+    folder = os.path.join(ctx["work"], f"slideshow_{count}")
+    os.makedirs(folder, exist_ok=True)
+    sources = ctx["fixtures"]["images"]
+    paths = []
+    for i in range(count):
+        src = sources[i % len(sources)]
+        path = os.path.join(folder, f"{i + 1:04d}{os.path.splitext(src)[1]}")
+        if not os.path.exists(path):
+            try:
+                os.symlink(src, path)
+            except OSError:
+                shutil.copyfile(src, path)
+        paths.append(path)
+    return paths
+
+
+def _slideshow_case(count: int) -> Callable[[dict], tuple]:
+    """
+    MoviePy slideshow of `count` images in a fresh interpreter, reporting its peak RSS:
+    frames are decoded lazily, so memory should stay flat as the image count grows.
+    """
+    def run(ctx: dict) -> tuple:
+        fixtures = ctx["fixtures"]
+        work = tempfile.mkdtemp(prefix=f"slideshow{count}_", dir=ctx["work"])
+        options = {
+            "audio_path": fixtures["audio"],
+            "image_paths": _slideshow_images(ctx, count),
+            "output_path": os.path.join(work, "output.mp4"),
+            "subtitle_dir": os.path.join(work, "subtitles"),
+            "model_size": "base",
+            "fps": ctx["fps"],
+            "translate_subs": True,
+            "transcript_cache_dir": ctx["transcripts"],
+            "whisper_backend": "faster",
+            "workers": ctx["workers"],
+            "encoders": {"base": ctx["profile"]["base"], "burn": ctx["profile"]["burn"]},
+            "size": list(ctx["size"]),
+            "engine": "moviepy",
+        }
+        proc = _python(["-c", _SLIDESHOW_SCRIPT, json.dumps(options)], ctx)
+        measured = json.loads(proc.stdout.strip().splitlines()[-1])
+        return int(round(fixtures["seconds"] * ctx["fps"])), fixtures["seconds"], measured
+    return run
+
+
+CASES: List[Case] = [
+    Case("startup/help", "runs", {"budget_s": HELP_BUDGET_S}, _bench_help),
+    Case("startup/cache_hit", "runs", {"budget_s": CACHE_HIT_BUDGET_S, "forbidden": HEAVY_MODULES},
+         _bench_cache_hit),
+    Case("resize_image", "images", {}, _bench_resize),
+    Case("format_timestamp", "calls", {}, _bench_format_timestamp),
+    Case("to_ass", "segments", {"max_line_chars": 42}, _bench_to_ass),
+    Case("video/moviepy", "frames", {"engine": "moviepy"}, _video_case(engine="moviepy")),
+    Case("video/moviepy_2pass", "frames", {"engine": "moviepy", "keep_intermediate": True},
+         _video_case(engine="moviepy", keep_intermediate=True)),
+    Case("video/ffmpeg", "frames", {"engine": "ffmpeg"}, _video_case(engine="ffmpeg")),
+    Case("video/ffmpeg_vfr", "frames", {"engine": "ffmpeg", "vfr": True}, _video_case(engine="ffmpeg", vfr=True)),
+    Case("memory/slideshow_50", "frames", {"engine": "moviepy", "images": 50}, _slideshow_case(50)),
+    Case("memory/slideshow_500", "frames", {"engine": "moviepy", "images": 500}, _slideshow_case(500)),
+    Case("shorts/moviepy", "frames", {"engine": "moviepy"}, _shorts_case(engine="moviepy")),
+    Case("shorts/moviepy_single_decode", "frames", {"engine": "moviepy", "single_decode": True},
+         _shorts_case(engine="moviepy", single_decode=True)),
+    Case("shorts/moviepy_workers2", "frames", {"engine": "moviepy", "workers": 2},
+         _shorts_case(engine="moviepy", workers=2)),
+    Case("shorts/ffmpeg", "frames", {"engine": "ffmpeg"}, _shorts_case(engine="ffmpeg")),
+    Case("shorts/ffmpeg_single_decode", "frames", {"engine": "ffmpeg", "single_decode": True},
+         _shorts_case(engine="ffmpeg", single_decode=True)),
+    Case("shorts/stream_copy", "frames", {"engine": "ffmpeg", "stream_copy": True},
+         _shorts_case(engine="ffmpeg", stream_copy=True)),
+]
+
+
+def run_cases(cases: List[Case], ctx: dict) -> List[dict]:
+    results = []
+    for case in cases:
+        print(f"running {case.name} ...", file=sys.stderr, flush=True)
+        row = {"name": case.name, "unit": case.unit, "options": case.options, "ok": False, "error": None}
+        try:
+            with stage(f"bench:{case.name}") as rec:
+                items, seconds, *measured = case.fn(ctx)
+            row.update(ok=True, items=items, media_seconds=seconds)
+        except Exception as e:
+            logger.exception("Benchmark %s failed", case.name)
+            row["error"] = str(e) or type(e).__name__
+            measured = []
+        wall = rec["wall_s"]
+        row.update(wall_s=wall, cpu_s=rec["cpu_s"], peak_rss_mb=rec["peak_rss_mb"])
+        for extra in measured:
+            row.update(extra)
+        if row["ok"] and wall > 0:
+            row["rate"] = round(row["items"] / wall, 2)
+            row["realtime"] = round(row["media_seconds"] / wall, 3) if row["media_seconds"] else None
+        results.append(row)
+    return results
+
+
+def print_table(results: List[dict], previous: dict | None = None) -> None:
+    """
+    Print one row per case; with previous results, also the throughput ratio
+    (new rate / old rate, >1 = faster).
+    """
+    header = f"{'case':<30} {'wall s':>8} {'cpu s':>8} {'rss MB':>7} {'throughput':>23} {'realtime':>9}"
+    if previous is not None:
+        header += f" {'vs prev':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if not r["ok"]:
+            print(f"{r['name']:<30} FAILED: {r['error']}")
+            continue
+        realtime = f"{r['realtime']:.2f}x" if r.get("realtime") else "-"
+        line = (
+            f"{r['name']:<30} {r['wall_s']:>8.2f} {r['cpu_s']:>8.2f} {r['peak_rss_mb']:>7.0f} "
+            f"{r['rate']:>12,.1f} {r['unit'] + '/s':<10} {realtime:>9}"
+        )
+        if previous is not None:
+            old = previous.get(r["name"])
+            line += f" {r['rate'] / old:>7.2f}x" if old else f" {'-':>8}"
+        print(line)
+
+
+def _load_previous(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {r["name"]: r["rate"] for r in data.get("results", []) if r.get("ok") and r.get("rate")}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="SyncShot pipeline benchmarks (synthetic inputs)")
+    parser.add_argument("--seconds", type=float, default=20.0, help="synthetic audio length")
+    parser.add_argument("--images", type=int, default=8, help="number of synthetic images")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--size", default="1920x1080", help="slideshow size WxH")
+    parser.add_argument("--profile", default="balanced", choices=sorted(RENDER_PROFILES))
+    parser.add_argument("--workers", type=int, default=None, help="image resize processes (default: all cores)")
+    parser.add_argument("--repeat", type=int, default=1, help="repeat count for micro benchmarks")
+    parser.add_argument("--short-len", type=float, default=None, help="default: min(10, seconds/3)")
+    parser.add_argument("--short-count", type=int, default=2)
+    parser.add_argument("--only", action="append", default=[], help="run cases whose name contains this (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="where synthetic inputs are generated/reused")
+    parser.add_argument("--out", default=None, help="results JSON (default: .cache/benchmarks/results/bench_<time>.json)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to compare throughput against")
+    parser.add_argument("--keep", action="store_true", help="keep rendered outputs (printed path)")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    setup_logging(level=args.log_level)
+
+    cases = [c for c in CASES if not args.only or any(s in c.name for s in args.only)]
+    if args.list or not cases:
+        for c in CASES:
+            print(c.name)
+        return 0 if cases else 1
+
+    try:
+        w, h = (int(v) for v in args.size.lower().split("x"))
+    except ValueError:
+        parser.error(f"--size must be WxH, got {args.size!r}")
+
+    fixtures = build_fixtures(args.fixtures, args.seconds, args.images, seed=args.seed)
+    transcripts = os.path.join(fixtures["dir"], "transcripts")
+    seed_transcript(transcripts, fixtures["audio"], fixtures["segments"])
+
+    work = tempfile.mkdtemp(prefix="syncshot_bench_")
+    ctx = {
+        "fixtures": fixtures,
+        "transcripts": transcripts,
+        "work": work,
+        "fps": args.fps,
+        "size": (w, h),
+        "profile": RENDER_PROFILES[args.profile],
+        "workers": args.workers,
+        "repeat": max(1, args.repeat),
+        "short_len": args.short_len or min(10.0, args.seconds / 3.0),
+        "short_count": args.short_count,
+    }
+    params = {
+        "seconds": args.seconds, "images": args.images, "seed": args.seed, "fps": args.fps,
+        "size": [w, h], "profile": args.profile, "workers": args.workers, "repeat": ctx["repeat"],
+        "short_len": ctx["short_len"], "short_count": args.short_count,
+    }
+
+    try:
+        with RunReport(None, meta=params) as report:
+            results = run_cases(cases, ctx)
+    finally:
+        if args.keep:
+            print(f"Outputs kept in {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    previous = _load_previous(args.compare) if args.compare else None
+    print_table(results, previous)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "version": _git_version(),
+                "host": report.data.get("host"),
+                "params": params,
+                "results": results,
+            },
+            f, indent=2,
+        )
+    print(f"Results saved: {out}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
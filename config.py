@@ -23,13 +23,95 @@ OUTPUT_VIDEO = os.path.join(VIDEO_DIR, f"output.mp4")
 # Options: "tiny", "base", "small", "medium", "large"
 MODEL_SIZE = os.getenv("WHISPER_MODEL", "base")
 
+# Transcription backend: "faster" (faster-whisper / CTranslate2) or "openai" (openai-whisper / PyTorch)
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "faster")
+# faster-whisper options: int8 quantization is the fast path on CPU-only boxes
+WHISPER_OPTIONS = {
+    "device": os.getenv("WHISPER_DEVICE", "auto"),
+    "compute_type": os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+    "cpu_threads": int(os.getenv("WHISPER_CPU_THREADS", "0")),  # 0 = CTranslate2 default
+    # > 1: long audio is split at VAD silences and chunks transcribed on this many model replicas
+    "num_workers": int(os.getenv("WHISPER_NUM_WORKERS", "1")),
+    # max chunk length for that parallel mode (0 = always one sequential pass)
+    "chunk_seconds": float(os.getenv("WHISPER_CHUNK_SECONDS", "600")),
+}
+
 # Subtitles
 TRANSLATE_SUBS = True  # True = Hindi→English, False = keep original
 
 # Video render settings
 FPS = 24
 PRESET = "medium"
+# Named encoder settings per stage: "base" (slideshow encode, subtitles burned in the
+# same pass by default), "burn" (KEEP_INTERMEDIATE second pass) and "shorts".
+# codec may be a preference list; the first encoder the local ffmpeg supports is used.
+# lookahead = rc-lookahead frames, gop = max keyframe interval, threads 0 = CPU split.
+RENDER_PROFILES = {
+    # previews: ~10x faster than "balanced", visibly softer
+    "draft": {
+        "base": {"codec": "libx264", "preset": "ultrafast", "crf": 30, "tune": "stillimage", "lookahead": 0, "gop": 250},
+        "burn": {"codec": "libx264", "preset": "ultrafast", "crf": 30, "tune": "stillimage", "lookahead": 0, "gop": 250},
+        "shorts": {"codec": "libx264", "preset": "ultrafast", "crf": 30, "tune": "stillimage", "lookahead": 0},
+    },
+    # the long-standing output: x264's own defaults (CRF 23, lookahead 40, keyint 250), no tune
+    "balanced": {
+        "base": {"codec": "libx264", "preset": PRESET, "crf": 23, "lookahead": 40, "gop": 250},
+        "burn": {"codec": "libx264", "preset": PRESET, "crf": 23, "lookahead": 40, "gop": 250},
+        "shorts": {"codec": "libx264", "preset": PRESET, "crf": 23, "lookahead": 40},
+    },
+    # smallest files for long-term storage; slow
+    "archive": {
+        "base": {
+            "codec": ["libsvtav1", "libx265", "libx264"], "preset": "slow",
+            "crf": {"libsvtav1": 32, "libx265": 24, "libx264": 19}, "tune": "stillimage", "lookahead": 60, "gop": 250,
+        },
+        "burn": {
+            "codec": ["libsvtav1", "libx265", "libx264"], "preset": "slow",
+            "crf": {"libsvtav1": 32, "libx265": 24, "libx264": 19}, "tune": "stillimage", "lookahead": 60, "gop": 250,
+        },
+        "shorts": {"codec": "libx264", "preset": "slow", "crf": 19, "tune": "stillimage", "lookahead": 60},
+    },
+}
+RENDER_PROFILE = os.getenv("RENDER_PROFILE", "balanced")
+# Slideshow engine: "moviepy" (per-frame compositing) or "ffmpeg" (concat demuxer, no Python frames)
+RENDER_ENGINE = os.getenv("RENDER_ENGINE", "moviepy")
+# ffmpeg engine only: one frame per image/subtitle change instead of constant FPS
+SLIDESHOW_VFR = os.getenv("SLIDESHOW_VFR", "0") == "1"
+# Processes for image decode/resize (unset = all cores, 1 = serial)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "0")) or None
+# MoviePy engine: images decoded ahead of the encoder (memory ~ (prefetch + 1) frames);
+# raised to IMAGE_WORKERS - 1 so every decode thread has an image
+SLIDESHOW_PREFETCH = int(os.getenv("SLIDESHOW_PREFETCH", "2"))
+# Resized-frame cache (content-addressed, LRU-evicted past the cap); empty dir disables it
+FRAME_CACHE_DIR = os.getenv("FRAME_CACHE_DIR", os.path.join(".cache", "frames"))
+FRAME_CACHE_MAX_MB = int(os.getenv("FRAME_CACHE_MAX_MB", "4096"))
+# Whisper segment cache keyed by audio hash + model + task + language; empty disables it
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", os.path.join(".cache", "transcripts"))
+# Shorts engine: "moviepy" (NumPy compositing) or "ffmpeg" (layout as an ffmpeg filter graph)
+SHORTS_ENGINE = os.getenv("SHORTS_ENGINE", "moviepy")
+# Cut shorts losslessly with stream copy (keyframe-snapped, no 9:16 re-layout)
+SHORTS_STREAM_COPY = os.getenv("SHORTS_STREAM_COPY", "0") == "1"
+# Processes rendering shorts in parallel (each gets cpu_count // SHORTS_WORKERS x264 threads)
+SHORTS_WORKERS = int(os.getenv("SHORTS_WORKERS", "1"))
+# `main.py --preview`: low-res draft of the whole pipeline in its own folder (never wiped)
+PREVIEW_DIR = os.path.join(OUTPUT_BASE, "preview")
+PREVIEW_SIZE = (854, 480)
+PREVIEW_SHORT_SIZE = (360, 640)
+# used unless a transcript of MODEL_SIZE is already cached
+PREVIEW_MODEL = os.getenv("PREVIEW_MODEL", "tiny")
+PREVIEW_SHORTS = int(os.getenv("PREVIEW_SHORTS", "2"))
+# `main.py --worker`: job-spec spool directory, parallel jobs, idle poll interval
+SPOOL_DIR = os.getenv("SPOOL_DIR", "spool")
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
+SPOOL_POLL_SECONDS = float(os.getenv("SPOOL_POLL_SECONDS", "2"))
+# Keep the subtitle-less base video and burn subtitles in a second ffmpeg pass (debugging only)
+KEEP_INTERMEDIATE = os.getenv("KEEP_INTERMEDIATE", "0") == "1"
+
 
-# Ensure output dirs exist
-for folder in [SUBTITLE_DIR, VIDEO_DIR, SHORTS_DIR]:
-    os.makedirs(folder, exist_ok=True)
+def ensure_output_dirs():
+    """
+    Create the default output folders. Called by the pipeline run, not at import, so
+    `--help`, tools and benchmarks importing config leave the working directory alone.
+    """
+    for folder in [SUBTITLE_DIR, VIDEO_DIR, SHORTS_DIR]:
+        os.makedirs(folder, exist_ok=True)
@@ -1,40 +1,209 @@
+import argparse
 import logging
 import os
+import signal
+import sys
+import threading
+import time
 from pathlib import Path
 from config import (
     AUDIO_FOLDER, IMAGE_FOLDER,
     OUTPUT_VIDEO, SHORTS_DIR, SUBTITLE_DIR,
-    MODEL_SIZE, TRANSLATE_SUBS, FPS, PRESET, VIDEO_DIR,
+    MODEL_SIZE, TRANSLATE_SUBS, FPS, PRESET, OUTPUT_BASE, KEEP_INTERMEDIATE,
+    RENDER_ENGINE, IMAGE_WORKERS, SLIDESHOW_PREFETCH, FRAME_CACHE_DIR, FRAME_CACHE_MAX_MB,
+    TRANSCRIPT_CACHE_DIR, WHISPER_BACKEND, WHISPER_OPTIONS, SHORTS_WORKERS,
+    SHORTS_ENGINE, SHORTS_STREAM_COPY, SLIDESHOW_VFR, RENDER_PROFILES, RENDER_PROFILE,
+    PREVIEW_DIR, PREVIEW_SIZE, PREVIEW_SHORT_SIZE, PREVIEW_MODEL, PREVIEW_SHORTS,
+    SPOOL_DIR, WORKER_CONCURRENCY, SPOOL_POLL_SECONDS, ensure_output_dirs,
     # add LOG_LEVEL / LOG_FILE in config if you want
 )
 from utils.clear_output import SUB_EXTS, VIDEO_EXTS, clear_dir, delete_file_if_exists, delete_output_subtitled
 from utils.logger import setup_logging
+from utils.manifest import BuildManifest
+from utils.timing import RunReport
+from pipeline.batch import JobResult, discover_jobs, episode_images, log_throughput
+from pipeline.ffmpeg_utils import probe_duration
+from pipeline.frame_cache import FrameCache
+from pipeline.runner import file_digests, run_stage
+from pipeline.transcript_cache import has_segments, transcript_key, transcript_options
 from pipeline.video_generator import generate_video
 from pipeline.shorts_creator import create_shorts
+from pipeline.spool import SpoolQueue, serve
 
 logger = logging.getLogger(__name__)
 
-def main():
+def _preview_model(audio_file: str) -> str:
+    """
+    The configured model when its transcript is already cached (a hit costs nothing
+    and shows the real subtitle timing), else the fast preview model.
+    """
+    if TRANSCRIPT_CACHE_DIR:
+        task = "translate" if TRANSLATE_SUBS else "transcribe"
+        key = transcript_key(audio_file, MODEL_SIZE, task, backend=WHISPER_BACKEND, options=WHISPER_OPTIONS)
+        if has_segments(TRANSCRIPT_CACHE_DIR, key):
+            return MODEL_SIZE
+    return PREVIEW_MODEL
+
+
+def main(
+    preview: bool = False,
+    force: bool = False,
+    batch: list[str] | None = None,
+    worker: str | None = None,
+    concurrency: int = WORKER_CONCURRENCY,
+    once: bool = False,
+):
     setup_logging(level=os.getenv("LOG_LEVEL", "INFO"), log_file=os.getenv("LOG_FILE"))
+
+    if worker:
+        return run_worker(worker, concurrency=concurrency, once=once)
+    if batch:
+        return run_batch(batch, preview=preview, force=force)
+
+    if preview:
+        # separate tree: a preview never touches (or wipes) real outputs
+        base_dir = PREVIEW_DIR
+        subtitle_dir = os.path.join(PREVIEW_DIR, "subtitles")
+        shorts_dir = os.path.join(PREVIEW_DIR, "shorts")
+        output_video = os.path.join(PREVIEW_DIR, "videos", "output.mp4")
+        logger.info("Preview mode: outputs in %s", PREVIEW_DIR)
+    else:
+        base_dir = OUTPUT_BASE
+        subtitle_dir, shorts_dir, output_video = SUBTITLE_DIR, SHORTS_DIR, OUTPUT_VIDEO
+        ensure_output_dirs()
+
+    manifest = _open_manifest(base_dir, subtitle_dir, shorts_dir, output_video)
+    audio_file, image_files = _collect_inputs()
+    _run(audio_file, image_files, subtitle_dir, shorts_dir, output_video, manifest, preview=preview, force=force)
+
+
+def run_batch(paths: list[str], preview: bool = False, force: bool = False) -> dict:
+    """
+    Run the pipeline for every episode found in paths (see batch.discover_jobs), one
+    after another in this process, so imports and the Whisper model (cached by
+    subtitle_utils._get_model) are paid once. Each episode gets its own output folder
+    and manifest under <output>/batch/<name>. A failing episode is logged and skipped.
+    """
+    jobs = discover_jobs(paths, default_images=IMAGE_FOLDER)
+    if not jobs:
+        raise FileNotFoundError(f"No batch jobs found in {paths}")
+
+    root = os.path.join(PREVIEW_DIR if preview else OUTPUT_BASE, "batch")
+    logger.info("Batch start jobs=%d out=%s", len(jobs), root)
+
+    results: list[JobResult] = []
+    t_batch = time.perf_counter()
+    for n, job in enumerate(jobs, 1):
+        logger.info("Batch job %d/%d name=%s audio=%s images=%d", n, len(jobs), job.name, job.audio, len(job.images))
+        job_dir = os.path.join(root, job.name)
+        subtitle_dir = os.path.join(job_dir, "subtitles")
+        shorts_dir = os.path.join(job_dir, "shorts")
+        output_video = os.path.join(job_dir, "videos", "output.mp4")
+
+        t0 = time.perf_counter()
+        try:
+            manifest = _open_manifest(job_dir, subtitle_dir, shorts_dir, output_video)
+            outputs = _run(
+                job.audio, job.images, subtitle_dir, shorts_dir, output_video, manifest,
+                preview=preview, force=force,
+            )
+            results.append(JobResult(
+                job.name, True, probe_duration(job.audio), time.perf_counter() - t0, len(outputs["shorts"]),
+            ))
+        except Exception as e:
+            logger.exception("Batch job failed name=%s", job.name)
+            error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            results.append(JobResult(job.name, False, 0.0, time.perf_counter() - t0, 0, error))
+
+    return log_throughput(results, time.perf_counter() - t_batch)
+
+
+def run_worker(spool_dir: str, concurrency: int = 1, once: bool = False) -> dict:
+    """
+    Serve job specs dropped into <spool_dir>/incoming/ (see spool.SpoolQueue) until
+    SIGINT/SIGTERM (running jobs are finished first), or until the queue is empty
+    with once=True. Whisper stays loaded across jobs; concurrent jobs share it.
+    """
+    queue = SpoolQueue(spool_dir)
+    stop = threading.Event()
+
+    def _stop(signum, frame):
+        logger.info("Signal %s: no new jobs; finishing running ones", signum)
+        stop.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    return serve(queue, _spool_job, concurrency=concurrency, once=once, poll=SPOOL_POLL_SECONDS, stop=stop)
+
+
+def _spool_job(job_id: str, spec: dict, progress) -> dict:
+    """
+    Worker job body. Spec (JSON object):
+        audio:   audio file path
+        images:  list of image paths, or a folder (images in it or in its images/)
+        name:    output folder name under <output>/jobs/ (default: job id)
+        preview: low-res draft (see --preview); force: rerun all stages
+        shorts:  overrides such as {"short_len": 30, "count": 3, "layout": "fill"}
+    Relative paths are resolved against the worker's working directory.
+    """
+    audio = spec.get("audio")
+    if not audio:
+        raise ValueError("job spec needs 'audio'")
+    images = spec.get("images")
+    if isinstance(images, str):
+        images = episode_images(images) if os.path.isdir(images) else []
+    if not images:
+        raise ValueError("job spec needs 'images' (a list of files or a folder with images)")
+
+    preview = bool(spec.get("preview"))
+    # name is a single folder name, never a path
+    name = os.path.basename(str(spec.get("name") or "")) or job_id
+    job_dir = os.path.join(PREVIEW_DIR if preview else OUTPUT_BASE, "jobs", name)
+    subtitle_dir = os.path.join(job_dir, "subtitles")
+    shorts_dir = os.path.join(job_dir, "shorts")
+    output_video = os.path.join(job_dir, "videos", "output.mp4")
+
+    manifest = _open_manifest(job_dir, subtitle_dir, shorts_dir, output_video)
+    return _run(
+        audio, list(images), subtitle_dir, shorts_dir, output_video, manifest,
+        preview=preview, force=bool(spec.get("force")), shorts=spec.get("shorts"), on_stage=progress,
+    )
+
+
+def _open_manifest(base_dir: str, subtitle_dir: str, shorts_dir: str, output_video: str) -> BuildManifest:
+    # Stages rerun only when their input fingerprints change, and then delete only the
+    # outputs they recorded. Without a manifest (first run) the folders are unknown
+    # territory, so they get the old blanket clear once.
+    manifest = BuildManifest(os.path.join(base_dir, "manifest.json"))
+    if not manifest.loaded:
+        _clear_outputs(subtitle_dir, shorts_dir, output_video)
+    else:
+        for folder in (subtitle_dir, shorts_dir, os.path.dirname(output_video) or "."):
+            Path(folder).mkdir(parents=True, exist_ok=True)
+    return manifest
+
+
+def _clear_outputs(subtitle_dir: str, shorts_dir: str, output_video: str):
     # ✅ CLEAR OUTPUTS FIRST (before doing anything else)
     try:
         # ensure dirs exist (so later steps won't fail)
-        Path(SHORTS_DIR).mkdir(parents=True, exist_ok=True)
-        Path(SUBTITLE_DIR).mkdir(parents=True, exist_ok=True)
-        Path(os.path.dirname(OUTPUT_VIDEO) or ".").mkdir(parents=True, exist_ok=True)
+        Path(shorts_dir).mkdir(parents=True, exist_ok=True)
+        Path(subtitle_dir).mkdir(parents=True, exist_ok=True)
+        Path(os.path.dirname(output_video) or ".").mkdir(parents=True, exist_ok=True)
 
         logger.info("Clearing output folders...")
 
         # clear shorts
-        clear_dir(SHORTS_DIR, allowed_exts=VIDEO_EXTS)
+        clear_dir(shorts_dir, allowed_exts=VIDEO_EXTS)
 
         # clear subtitles
-        clear_dir(SUBTITLE_DIR, allowed_exts=SUB_EXTS)
+        clear_dir(subtitle_dir, allowed_exts=SUB_EXTS)
 
-        # delete final output video file (OUTPUT_VIDEO is a file path in your code)
-        delete_file_if_exists(OUTPUT_VIDEO)
+        # delete final output video file (output_video is a file path in your code)
+        delete_file_if_exists(output_video)
 
-        delete_output_subtitled(os.path.join(VIDEO_DIR, f"output_subtitled.mp4"))
+        delete_output_subtitled(os.path.splitext(output_video)[0] + "_subtitled.mp4")
 
         logger.info("Output folders cleared ✅")
     except Exception as e:
@@ -42,8 +211,7 @@ def main():
         raise
 
 
-    logger.info("SyncShot Pipeline Starting...")
-
+def _collect_inputs() -> tuple[str, list[str]]:
     # 🎵 Collect audio
     audio_files = [
         os.path.join(AUDIO_FOLDER, f)
@@ -67,41 +235,239 @@ def main():
         logger.error("No image files found in %s", IMAGE_FOLDER)
         raise FileNotFoundError(f"No image files found in {IMAGE_FOLDER}")
     logger.info("Found %d images", len(image_files))
+    return audio_file, image_files
+
+
+# Shorts settings a batch/worker job may override
+_SHORTS_OPTIONS = ("short_len", "count", "gap", "mode", "layout", "anchor_x", "anchor_y")
+
+
+def _run(
+    audio_file: str,
+    image_files: list[str],
+    subtitle_dir: str,
+    shorts_dir: str,
+    output_video: str,
+    manifest: BuildManifest,
+    preview: bool = False,
+    force: bool = False,
+    shorts: dict | None = None,
+    on_stage=None,
+) -> dict:
+    """
+    Run the video and shorts stages for one episode, profiling every stage into
+    run_report.json next to the manifest (wall/CPU time, peak RSS, bytes written).
+    shorts: per-job overrides of the shorts plan/layout (see _SHORTS_OPTIONS).
+    on_stage: optional callback(stage_name) called as each stage begins.
+    """
+    meta = {
+        "audio": audio_file,
+        "images": len(image_files),
+        "preview": preview,
+        "force": force,
+        "shorts_overrides": shorts or {},
+    }
+    report_path = os.path.join(os.path.dirname(manifest.path) or ".", "run_report.json")
+    with RunReport(report_path, meta=meta) as report:
+        return _run_pipeline(
+            audio_file, image_files, subtitle_dir, shorts_dir, output_video, manifest, report,
+            preview=preview, force=force, shorts=shorts, on_stage=on_stage,
+        )
+
+
+def _video_stage_inputs(
+    audio_file: str,
+    image_files: list[str],
+    output_video: str,
+    video_opts: dict,
+    whisper_options: dict,
+) -> dict:
+    """
+    Fingerprint inputs of the video stage. Of the Whisper options only the ones that
+    change the transcript count, the same set the transcript cache is keyed by (see
+    transcript_cache.transcript_options); e.g. cpu_threads only changes speed.
+    """
+    return {
+        "audio": file_digests([audio_file]),
+        "images": file_digests(image_files),
+        "output": output_video,
+        **video_opts,
+        "whisper_options": transcript_options(video_opts.get("whisper_backend", "faster"), whisper_options),
+    }
+
+
+def _run_pipeline(
+    audio_file: str,
+    image_files: list[str],
+    subtitle_dir: str,
+    shorts_dir: str,
+    output_video: str,
+    manifest: BuildManifest,
+    report: RunReport,
+    preview: bool = False,
+    force: bool = False,
+    shorts: dict | None = None,
+    on_stage=None,
+) -> dict:
+    logger.info("SyncShot Pipeline Starting...")
+
+    shorts = dict(shorts or {})
+    unknown = sorted(set(shorts) - set(_SHORTS_OPTIONS))
+    if unknown:
+        raise ValueError(f"Unknown shorts options: {unknown} (expected some of {list(_SHORTS_OPTIONS)})")
+
+    profile_name = "draft" if preview else RENDER_PROFILE
+    if profile_name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown RENDER_PROFILE: {profile_name} (expected one of {sorted(RENDER_PROFILES)})")
+    profile = RENDER_PROFILES[profile_name]
+
+    model_size = _preview_model(audio_file) if preview else MODEL_SIZE
+    report.meta.update(profile=profile_name, model=model_size, backend=WHISPER_BACKEND)
 
     # 🎬 Generate video with subtitles
-    logger.info("Generating video (fps=%s preset=%s model=%s translate=%s)...",
-                FPS, PRESET, MODEL_SIZE, TRANSLATE_SUBS)
-
-    subtitled_video = generate_video(
-        audio_file,
-        image_files,
-        OUTPUT_VIDEO,
-        subtitle_dir=SUBTITLE_DIR,
-        model_size=MODEL_SIZE,
+    logger.info("Generating video (fps=%s profile=%s model=%s backend=%s translate=%s)...",
+                FPS, profile_name, model_size, WHISPER_BACKEND, TRANSLATE_SUBS)
+
+    frame_cache = None
+    if FRAME_CACHE_DIR:
+        frame_cache = FrameCache(FRAME_CACHE_DIR, max_bytes=FRAME_CACHE_MAX_MB * 1024 * 1024)
+
+    # Shorts ranges are deterministic, so their cut points are forced as keyframes
+    # in the long video and every shorts seek lands on an IDR frame.
+    shorts_plan = {
+        "short_len": 50,  # ✅ 50 sec each
+        "count": None,    # ✅ None = generate all possible 50s shorts till video end
+        "gap": 0.0,
+    }
+    if preview:
+        shorts_plan["count"] = PREVIEW_SHORTS
+    shorts_plan.update({k: v for k, v in shorts.items() if k in shorts_plan})
+
+    # Everything below that changes the rendered output is part of a stage fingerprint;
+    # image/shorts worker counts and caches only change how fast it is produced (Whisper
+    # options are filtered by transcript_options, see _video_stage_inputs).
+    video_opts = dict(
+        model_size=model_size,
         fps=FPS,
         preset=PRESET,
-        translate_subs=TRANSLATE_SUBS
+        translate_subs=TRANSLATE_SUBS,
+        keep_intermediate=KEEP_INTERMEDIATE and not preview,
+        # previews: ffmpeg engine, one frame per image/subtitle change
+        engine="ffmpeg" if preview else RENDER_ENGINE,
+        shorts_plan=shorts_plan,
+        vfr=preview or SLIDESHOW_VFR,
+        encoders={"base": profile["base"], "burn": profile["burn"]},
+        size=PREVIEW_SIZE if preview else (1920, 1080),
+        whisper_backend=WHISPER_BACKEND,
+    )
+    report.meta["video_opts"] = video_opts
+    report.meta["whisper_options"] = WHISPER_OPTIONS
+
+    def _video_stage() -> list[str]:
+        subs_before = set(os.listdir(subtitle_dir))
+        path = generate_video(
+            audio_file,
+            image_files,
+            output_video,
+            subtitle_dir=subtitle_dir,
+            workers=IMAGE_WORKERS,
+            prefetch=SLIDESHOW_PREFETCH,
+            frame_cache=frame_cache,
+            transcript_cache_dir=TRANSCRIPT_CACHE_DIR or None,
+            whisper_options=WHISPER_OPTIONS,
+            **video_opts,
+        )
+        new_subs = sorted(set(os.listdir(subtitle_dir)) - subs_before)
+        outputs = [path] + [os.path.join(subtitle_dir, f) for f in new_subs]
+        if video_opts["keep_intermediate"]:
+            outputs.append(output_video)
+        return outputs
+
+    if on_stage:
+        on_stage("video")
+    video_outputs, video_fp = run_stage(
+        manifest,
+        "video",
+        _video_stage_inputs(audio_file, image_files, output_video, video_opts, WHISPER_OPTIONS),
+        _video_stage,
+        force=force,
     )
+    subtitled_video = video_outputs[0]
 
     logger.info("Video generated: %s", subtitled_video)
 
     # ✂️ Create shorts
-    logger.info("Creating shorts into: %s", SHORTS_DIR)
+    logger.info("Creating shorts into: %s", shorts_dir)
     #create_shorts(subtitled_video, shorts_dir=SHORTS_DIR)
-    create_shorts(
-        subtitled_video,
-        shorts_dir=SHORTS_DIR,
+    short_w, short_h = PREVIEW_SHORT_SIZE if preview else (1080, 1920)
+    shorts_opts = dict(
         fps=FPS,
         preset=PRESET,
-        mode="start",     # ✅ start -> end
-        short_len=50,     # ✅ 50 sec each
-        count=None,       # ✅ None = generate all possible 50s shorts till video end
-        layout="fit_bg",       # ✅ recommended
-        anchor_x="center",
-        anchor_y="center",
+        out_w=short_w,
+        out_h=short_h,
+        mode=shorts.get("mode", "start"),     # ✅ start -> end
+        **shorts_plan,
+        layout=shorts.get("layout", "fit_bg"),       # ✅ recommended
+        anchor_x=shorts.get("anchor_x", "center"),
+        anchor_y=shorts.get("anchor_y", "center"),
+        engine="ffmpeg" if preview else SHORTS_ENGINE,
+        stream_copy=SHORTS_STREAM_COPY,
+        encoder=profile["shorts"],
+    )
+    report.meta["shorts_opts"] = shorts_opts
+
+    if on_stage:
+        on_stage("shorts")
+    shorts_outputs, _ = run_stage(
+        manifest,
+        "shorts",
+        {"video": video_fp, "shorts_dir": shorts_dir, **shorts_opts},
+        lambda: create_shorts(
+            subtitled_video,
+            shorts_dir=shorts_dir,
+            single_decode=True,  # ✅ one decode of the long video for all shorts
+            workers=SHORTS_WORKERS,  # ✅ >1 = render shorts in parallel processes
+            require_all=True,  # a missing short leaves the stage unrecorded, so it is retried
+            **shorts_opts,
+        ),
+        force=force,
     )
 
     logger.info("SyncShot Pipeline Completed ✅")
+    return {"video": subtitled_video, "shorts": shorts_outputs}
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="SyncShot: audio + images -> subtitled video + shorts")
+    parser.add_argument(
+        "--preview", action="store_true",
+        help=f"fast low-res draft (draft profile, {PREVIEW_MODEL} model unless cached, "
+             f"{PREVIEW_SHORTS} shorts) into {PREVIEW_DIR}; real outputs are left untouched",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="rerun every stage even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--batch", nargs="+", metavar="PATH",
+        help="process many episodes in one run: audio files (images from a same-named folder) "
+             "and/or episode folders (audio + images), or a folder of episode folders",
+    )
+    parser.add_argument(
+        "--worker", nargs="?", const=SPOOL_DIR, metavar="SPOOL_DIR",
+        help=f"run as a worker serving JSON job specs from SPOOL_DIR/incoming (default {SPOOL_DIR})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=WORKER_CONCURRENCY,
+        help="jobs processed in parallel by --worker",
+    )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="with --worker: process the queued jobs, then exit",
+    )
+    args = parser.parse_args()
+    summary = main(
+        preview=args.preview, force=args.force, batch=args.batch,
+        worker=args.worker, concurrency=args.concurrency, once=args.once,
+    )
+    if summary and summary.get("failed"):
+        sys.exit(1)
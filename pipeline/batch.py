@@ -0,0 +1,134 @@
+import logging
+import os
+from typing import List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTS = (".mp4", ".m4a")
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+class BatchJob(NamedTuple):
+    """
+    One episode: an audio file and the images shown over it.
+    """
+    name: str
+    audio: str
+    images: List[str]
+
+
+class JobResult(NamedTuple):
+    name: str
+    ok: bool
+    audio_seconds: float
+    wall_seconds: float
+    shorts: int
+    error: str = ""
+
+
+def _files(folder: str, exts) -> List[str]:
+    return [
+        os.path.join(folder, f)
+        for f in sorted(os.listdir(folder))
+        if f.lower().endswith(exts) and os.path.isfile(os.path.join(folder, f))
+    ]
+
+
+def episode_images(folder: str) -> List[str]:
+    """
+    Sorted images in folder, or in its images/ subfolder if it has none.
+    """
+    images = _files(folder, IMAGE_EXTS)
+    sub = os.path.join(folder, "images")
+    if not images and os.path.isdir(sub):
+        images = _files(sub, IMAGE_EXTS)
+    return images
+
+
+def _episode(folder: str) -> BatchJob | None:
+    audio = _files(folder, AUDIO_EXTS)
+    if not audio:
+        return None
+    if len(audio) > 1:
+        logger.warning("Episode %s has %d audio files; using %s", folder, len(audio), os.path.basename(audio[0]))
+    return BatchJob(os.path.basename(os.path.normpath(folder)), audio[0], episode_images(folder))
+
+
+def discover_jobs(paths: List[str], default_images: str | None = None) -> List[BatchJob]:
+    """
+    Expand batch arguments into jobs, in the given order:
+
+    - an audio file: images from a sibling folder named after it (ep01.m4a -> ep01/),
+      else from default_images
+    - an episode folder (holds an audio file): that audio + its images
+      (in the folder itself or in images/)
+    - any other folder: every episode subfolder in it, sorted by name
+
+    Jobs without images are skipped with an error log. Duplicate names get a suffix,
+    since the name is also the job's output folder.
+    """
+    jobs: List[BatchJob] = []
+    for path in paths:
+        if os.path.isfile(path):
+            if not path.lower().endswith(AUDIO_EXTS):
+                logger.warning("Not an audio file, skipping: %s", path)
+                continue
+            stem = os.path.splitext(path)[0]
+            folder = stem if os.path.isdir(stem) else default_images
+            images = episode_images(folder) if folder and os.path.isdir(folder) else []
+            jobs.append(BatchJob(os.path.basename(stem), path, images))
+        elif os.path.isdir(path):
+            episode = _episode(path)
+            if episode is not None:
+                jobs.append(episode)
+                continue
+            for entry in sorted(os.listdir(path)):
+                sub = os.path.join(path, entry)
+                episode = _episode(sub) if os.path.isdir(sub) else None
+                if episode is not None:
+                    jobs.append(episode)
+        else:
+            logger.warning("Batch path not found, skipping: %s", path)
+
+    out: List[BatchJob] = []
+    seen: dict = {}
+    for job in jobs:
+        if not job.images:
+            logger.error("No images for %s (%s), skipping", job.name, job.audio)
+            continue
+        n = seen.get(job.name, 0)
+        seen[job.name] = n + 1
+        out.append(job._replace(name=f"{job.name}_{n + 1}") if n else job)
+    return out
+
+
+def log_throughput(results: List[JobResult], wall_seconds: float) -> dict:
+    """
+    Log per-job and aggregate throughput (audio seconds processed per wall second)
+    and return the aggregate numbers.
+    """
+    for r in results:
+        speed = r.audio_seconds / r.wall_seconds if r.wall_seconds else 0.0
+        logger.info(
+            "Batch job=%s status=%s audio=%.1fs wall=%.1fs speed=%.2fx realtime shorts=%d%s",
+            r.name, "ok" if r.ok else "FAILED", r.audio_seconds, r.wall_seconds, speed, r.shorts,
+            f" error={r.error}" if r.error else "",
+        )
+
+    ok = [r for r in results if r.ok]
+    audio = sum(r.audio_seconds for r in ok)
+    summary = {
+        "jobs": len(results),
+        "ok": len(ok),
+        "failed": len(results) - len(ok),
+        "audio_seconds": audio,
+        "wall_seconds": wall_seconds,
+        "speed": audio / wall_seconds if wall_seconds else 0.0,
+        "jobs_per_hour": len(ok) * 3600.0 / wall_seconds if wall_seconds else 0.0,
+    }
+    logger.info(
+        "Batch done jobs=%d ok=%d failed=%d audio=%.1fs wall=%.1fs speed=%.2fx realtime jobs_per_hour=%.1f",
+        summary["jobs"], summary["ok"], summary["failed"], audio, wall_seconds,
+        summary["speed"], summary["jobs_per_hour"],
+    )
+    return summary
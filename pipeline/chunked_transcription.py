@@ -0,0 +1,141 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from utils.timing import propagate, stage
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Silence (from VAD) must be at least this long to be a chunk boundary
+MIN_SILENCE_S = 0.5
+# Chunks aim for duration / (2 * workers) (a spare chunk per worker for load balancing),
+# clamped to [MIN_CHUNK_S, chunk_seconds]
+MIN_CHUNK_S = 30.0
+
+
+class Chunk(NamedTuple):
+    index: int
+    start: float
+    end: float
+
+
+def faster_segment_dict(seg) -> dict:
+    """
+    faster-whisper Segment -> openai-whisper style dict (start, end, text, words).
+    """
+    item = {"start": seg.start, "end": seg.end, "text": seg.text}
+    if seg.words:
+        item["words"] = [{"start": w.start, "end": w.end, "word": w.word} for w in seg.words]
+    return item
+
+
+def plan_chunks(speech: List[Tuple[float, float]], duration: float, target: float) -> List[Chunk]:
+    """
+    Split [0, duration] into chunks of roughly `target` seconds, cutting only in the
+    middle of silences between speech regions (sorted (start, end) seconds), so no
+    word is split. A speech region longer than target stays in one chunk.
+    """
+    cuts = [0.0]
+    for (_, end), (next_start, _) in zip(speech, speech[1:]):
+        if end - cuts[-1] >= target and next_start - end >= MIN_SILENCE_S:
+            cuts.append((end + next_start) / 2.0)
+    cuts.append(float(duration))
+    return [Chunk(i, a, b) for i, (a, b) in enumerate(zip(cuts, cuts[1:])) if b > a]
+
+
+def _offset(seg: dict, chunk: Chunk) -> dict:
+    """
+    Shift chunk-relative times to file time; clamp to the chunk (Whisper may run a
+    segment end into the padding past the chunk).
+    """
+    def _t(value: float) -> float:
+        return round(min(chunk.end, chunk.start + float(value)), 3)
+
+    out = dict(seg, start=_t(seg["start"]), end=max(_t(seg["start"]), _t(seg["end"])))
+    if seg.get("words"):
+        out["words"] = [dict(w, start=_t(w["start"]), end=_t(w["end"])) for w in seg["words"]]
+    return out
+
+
+def merge_segments(chunk_results: Iterable[List[dict]]) -> Iterator[dict]:
+    """
+    Concatenate per-chunk segment lists (already in file time, in chunk order) into one
+    stream. Chunks do not overlap and _offset clamps every segment to its chunk, so the
+    result is ordered with no boundary duplicates and needs no text-based dedupe
+    (which would also drop real repeats such as a short "yes" after "yes yes").
+    """
+    for segments in chunk_results:
+        yield from segments
+
+
+def plan_audio_chunks(
+    audio_path: str,
+    workers: int,
+    chunk_seconds: float = 600.0,
+) -> Tuple[object, List[Chunk]]:
+    """
+    Decode the file once, find speech with faster-whisper's Silero VAD and split it at
+    silences (plan_chunks). Returns (16 kHz samples, chunks). Needs no model, so the
+    caller can see how many chunks there are before choosing model replicas/threads.
+    """
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    with stage("vad"):
+        audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+        duration = len(audio) / SAMPLE_RATE
+        speech = [
+            (ts["start"] / SAMPLE_RATE, ts["end"] / SAMPLE_RATE)
+            for ts in get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=int(MIN_SILENCE_S * 1000)))
+        ]
+
+    target = min(float(chunk_seconds), max(MIN_CHUNK_S, duration / (2 * workers)))
+    chunks = plan_chunks(speech, duration, target)
+    logger.info(
+        "Chunked transcription duration=%.1fs speech_regions=%d chunks=%d target=%.0fs workers=%d",
+        duration, len(speech), len(chunks), target, workers,
+    )
+    return audio, chunks
+
+
+def transcribe_chunked(
+    model,
+    audio,
+    chunks: List[Chunk],
+    task: str,
+    language: str | None,
+    workers: int,
+) -> Tuple[Iterator[dict], str | None]:
+    """
+    faster-whisper transcription of a long file in parallel: transcribe the chunks of
+    plan_audio_chunks on `workers` threads. The model must be loaded with num_workers
+    >= workers: CTranslate2 then runs that many replicas side by side (the GIL is
+    released during inference).
+
+    Returns (segment_iterator, language) like _iter_model_segments. Segments come
+    out in order as soon as each chunk and all earlier ones are done, in file time
+    (merge_segments).
+    """
+    # one language for every chunk (each would otherwise detect its own)
+    if language is None and hasattr(model, "detect_language"):
+        with stage("detect_language"):
+            language = model.detect_language(audio)[0]
+        logger.info("Detected language=%s", language)
+
+    def _transcribe(chunk: Chunk) -> List[dict]:
+        with stage(f"transcribe_chunk{chunk.index}"):
+            piece = audio[int(chunk.start * SAMPLE_RATE):int(chunk.end * SAMPLE_RATE)]
+            seg_iter, _ = model.transcribe(piece, task=task, language=language)
+            return [_offset(faster_segment_dict(seg), chunk) for seg in seg_iter]
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper_chunk")
+    futures = [pool.submit(propagate(_transcribe), chunk) for chunk in chunks]
+
+    def _gen():
+        try:
+            yield from merge_segments(fut.result() for fut in futures)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    return _gen(), language
@@ -0,0 +1,126 @@
+import logging
+import subprocess
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Always built into the ffmpeg binaries this pipeline targets; last-resort fallback
+DEFAULT_CODEC = "libx264"
+
+# libsvtav1 takes numeric presets (0 = slowest .. 13 = fastest)
+_SVTAV1_PRESETS = {
+    "ultrafast": 12, "superfast": 11, "veryfast": 10, "faster": 9, "fast": 8,
+    "medium": 6, "slow": 5, "slower": 4, "veryslow": 2, "placebo": 0,
+}
+
+
+@lru_cache(maxsize=4)
+def available_encoders(binary: str = "ffmpeg") -> frozenset:
+    """
+    Names of the video encoders compiled into an ffmpeg binary (`ffmpeg -encoders`).
+    Empty if the binary cannot be run.
+    """
+    try:
+        result = subprocess.run(
+            [binary, "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        logger.warning("Could not list encoders of %s", binary, exc_info=True)
+        return frozenset()
+
+    names = set()
+    for line in result.stdout.splitlines():
+        # " V....D libx264   libx264 H.264 / AVC ..." (capability flags, name, description)
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0].startswith("V"):
+            names.add(parts[1])
+    logger.debug("ffmpeg %s video encoders=%d", binary, len(names))
+    return frozenset(names)
+
+
+def resolve_encoder(settings: dict | None, preset: str = "medium", binary: str = "ffmpeg") -> dict:
+    """
+    Turn one stage of a render profile into concrete encoder settings.
+
+    settings["codec"] may be a single encoder or a preference list; the first one the
+    ffmpeg binary supports wins (libx264 if none do). settings["crf"] may be a number
+    or a {codec: crf} map. settings=None gives the legacy defaults: libx264 with
+    `preset` and x264's own CRF.
+    """
+    resolved = dict(settings or {})
+    resolved.setdefault("preset", preset)
+
+    wanted = resolved.get("codec") or DEFAULT_CODEC
+    candidates = [wanted] if isinstance(wanted, str) else list(wanted)
+    supported = available_encoders(binary)
+
+    codec = next((c for c in candidates if c in supported), None)
+    if codec is None:
+        codec = DEFAULT_CODEC
+        if supported and candidates != [DEFAULT_CODEC]:
+            logger.warning("None of %s supported by %s; falling back to %s", candidates, binary, codec)
+    resolved["codec"] = codec
+
+    # CRF scales differ per codec (x264 23 ~ x265 28 ~ SVT-AV1 35), so a preference
+    # list usually comes with a {codec: crf} map
+    if isinstance(resolved.get("crf"), dict):
+        resolved["crf"] = resolved["crf"].get(codec)
+
+    if codec == "libsvtav1":
+        resolved["preset"] = str(_SVTAV1_PRESETS.get(str(resolved["preset"]), resolved["preset"]))
+    return resolved
+
+
+def encoder_params(settings: dict) -> list[str]:
+    """
+    Encoder options beyond codec/preset/threads (CRF, tune, lookahead, GOP) as ffmpeg
+    args, in the codec's own syntax. Suitable for MoviePy's ffmpeg_params.
+    """
+    codec = settings.get("codec", DEFAULT_CODEC)
+    args: list[str] = []
+
+    # MoviePy's writer feeds RGB frames and only adds -pix_fmt yuv420p for libx264;
+    # other encoders would keep 4:4:4/gbrp, which many players cannot decode
+    if codec != "libx264":
+        args += ["-pix_fmt", "yuv420p"]
+
+    if settings.get("crf") is not None:
+        args += ["-crf", str(settings["crf"])]
+    if settings.get("gop"):
+        args += ["-g", str(int(settings["gop"]))]
+
+    lookahead = settings.get("lookahead")
+    if codec == "libx264":
+        if settings.get("tune"):
+            args += ["-tune", settings["tune"]]
+        if lookahead is not None:
+            args += ["-rc-lookahead", str(int(lookahead))]
+    elif codec == "libx265":
+        # x265 has no stillimage tune; lookahead goes through its own param string
+        params = ["log-level=error"]
+        if lookahead is not None:
+            params.append(f"rc-lookahead={int(lookahead)}")
+        args += ["-x265-params", ":".join(params)]
+    elif codec == "libsvtav1" and lookahead is not None:
+        args += ["-svtav1-params", f"lookahead={int(lookahead)}"]
+
+    return args
+
+
+def encoder_args(settings: dict, threads: int | None = None) -> list[str]:
+    """
+    Full ffmpeg video-encoder args for resolved settings. A profile's own "threads"
+    (non-zero) overrides the caller's CPU split.
+    """
+    threads = settings.get("threads") or threads
+    args = ["-c:v", settings.get("codec", DEFAULT_CODEC), "-preset", str(settings["preset"])]
+    if threads:
+        args += ["-threads", str(int(threads))]
+    return args + encoder_params(settings)
+
+
+def encoder_threads(settings: dict, threads: int) -> int:
+    """
+    Thread count for an encode: the profile's "threads" if set, else the caller's.
+    """
+    return int(settings.get("threads") or threads)
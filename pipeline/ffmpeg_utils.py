@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+
+def run_ffmpeg(cmd: list[str], what: str = "ffmpeg") -> None:
+    """
+    Run an ffmpeg/ffprobe command, raising RuntimeError with its stderr on failure.
+    """
+    logger.debug("FFmpeg cmd (%s): %s", what, " ".join(cmd))
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        msg = (
+            f"FFmpeg {what} failed (code={result.returncode}).\n"
+            f"STDERR:\n{result.stderr}\nSTDOUT:\n{result.stdout}"
+        )
+        logger.error(msg)
+        raise RuntimeError(msg)
+
+
+def probe_media(path: str) -> dict:
+    """
+    Return ffprobe's JSON description (format + streams) of a media file.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_format", "-show_streams",
+        "-of", "json",
+        path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed for {path} (code={result.returncode}): {result.stderr}")
+    return json.loads(result.stdout or "{}")
+
+
+def probe_duration(path: str) -> float:
+    """
+    Container duration in seconds (0.0 if ffprobe does not report one).
+    """
+    info = probe_media(path)
+    try:
+        return float(info.get("format", {}).get("duration") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _concat_quote(path: str) -> str:
+    # concat demuxer syntax: single-quoted, with ' written as '\''
+    return "'" + os.path.abspath(path).replace("'", r"'\''") + "'"
+
+
+def write_concat_list(
+    entries: list[tuple[str, float]],
+    list_path: str,
+    file_options: dict | None = None,
+) -> str:
+    """
+    Write an ffmpeg concat-demuxer script for still images.
+
+    entries: (image_path, duration_seconds) in display order.
+    file_options: demuxer options applied to every file (e.g. {"framerate": 1000}).
+    The last image is listed twice: the demuxer ignores the duration of the final entry.
+    """
+    if not entries:
+        raise ValueError("entries is empty")
+
+    options = [f"option {k} {v}" for k, v in (file_options or {}).items()]
+
+    lines = ["ffconcat version 1.0"]
+    for path, duration in entries:
+        lines.append(f"file {_concat_quote(path)}")
+        lines.extend(options)
+        lines.append(f"duration {float(duration):.6f}")
+    lines.append(f"file {_concat_quote(entries[-1][0])}")
+    lines.extend(options)
+
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    return list_path
+
+
+def _parse_rate(rate: str | None) -> float:
+    try:
+        num, _, den = (rate or "0/1").partition("/")
+        return float(num) / float(den or 1)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def probe_video(path: str) -> dict:
+    """
+    Summarize a video file: duration, width, height, fps and whether it has audio.
+    """
+    info = probe_media(path)
+    streams = info.get("streams", [])
+
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise ValueError(f"No video stream in {path}")
+
+    try:
+        duration = float(info.get("format", {}).get("duration") or 0.0)
+    except (TypeError, ValueError):
+        duration = 0.0
+
+    return {
+        "duration": duration,
+        "width": int(video.get("width") or 0),
+        "height": int(video.get("height") or 0),
+        "fps": _parse_rate(video.get("avg_frame_rate")),
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+    }
+
+
+def probe_keyframes(path: str) -> list[float]:
+    """
+    Timestamps (seconds) of the video keyframes, read from packet flags (no decoding).
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe keyframes failed for {path} (code={result.returncode}): {result.stderr}")
+
+    times = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.strip().partition(",")
+        if "K" not in flags:
+            continue
+        try:
+            times.append(float(pts))
+        except ValueError:
+            continue
+    return sorted(times)
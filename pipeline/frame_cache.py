@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from utils.hashing import file_sha256, text_sha256
+from utils.jsonio import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# source path -> (size, mtime_ns, sha256) of every image seen, so unchanged files are
+# never hashed again
+_INDEX_NAME = "sources.json"
+
+
+def entry_path(cache_dir, key: str) -> Path:
+    """
+    Where the frame for `key` is stored under cache_dir.
+    """
+    return Path(cache_dir) / key[:2] / f"{key}.npy"
+
+
+def read_entry(cache_dir, key: str) -> np.ndarray | None:
+    """
+    The cached frame for `key`, or None. No bookkeeping: for worker processes, which
+    report hits back to the FrameCache (see FrameCache.note_lookup).
+    """
+    try:
+        return np.load(entry_path(cache_dir, key), allow_pickle=False)
+    except Exception:
+        return None
+
+
+class FrameCache:
+    """
+    Content-addressed on-disk cache of ready-to-use RGB frames (.npy).
+
+    Keys combine the source file's sha256 with the processing parameters
+    (target size, resampling filter, EXIF handling), so renamed/copied images
+    still hit and any parameter change misses.
+    Entries are evicted least-recently-used once the cache grows past max_bytes
+    (mtime, refreshed on every hit, carries the order across runs).
+
+    Source digests are remembered by (path, size, mtime) across runs (flush() saves
+    them), so only new or modified images are read in full to compute a key.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 4 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # path -> size, least recently used first; sorted by mtime once at load, then
+        # kept in order by moving entries to the end on every hit/put
+        found = []
+        for f in self.cache_dir.rglob("*.npy"):
+            try:
+                st = f.stat()
+                found.append((st.st_mtime, f, st.st_size))
+            except OSError:
+                pass
+        found.sort(key=lambda item: item[0])
+        self._entries: OrderedDict[Path, int] = OrderedDict((f, size) for _, f, size in found)
+        self._total = sum(self._entries.values())
+
+        # abspath -> (size, mtime_ns, sha256)
+        self._digests: dict[str, tuple[int, int, str]] = {}
+        self._digests_dirty = False
+        try:
+            with open(self.cache_dir / _INDEX_NAME, "r", encoding="utf-8") as f:
+                self._digests = {path: tuple(v) for path, v in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning("FrameCache source index unreadable, ignoring", exc_info=True)
+
+        logger.info(
+            "FrameCache ready dir=%s entries=%d size=%.1fMB cap=%.1fMB",
+            self.cache_dir, len(self._entries), self._total / 1e6, self.max_bytes / 1e6,
+        )
+
+    @staticmethod
+    def key_for(digest: str, *params) -> str:
+        """
+        Cache key for a source with this content sha256, processed with params.
+        """
+        return text_sha256(digest, *params)
+
+    def key(self, source_path: str, *params) -> str | None:
+        """
+        Cache key for source_path processed with params, or None if the file can't be read.
+        """
+        try:
+            digest = self.known_digest(source_path)
+            if digest is None:
+                digest = file_sha256(source_path)
+                self.remember(source_path, digest)
+        except OSError:
+            return None
+        return self.key_for(digest, *params)
+
+    def known_digest(self, source_path: str) -> str | None:
+        """
+        The sha256 recorded for source_path if the file is unchanged since (no read).
+        """
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return None
+        entry = self._digests.get(os.path.abspath(source_path))
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def remember(self, source_path: str, digest: str) -> None:
+        """
+        Record the sha256 of source_path's current contents (e.g. hashed by a worker).
+        """
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return
+        self._digests[os.path.abspath(source_path)] = (st.st_size, st.st_mtime_ns, digest)
+        self._digests_dirty = True
+
+    def flush(self) -> None:
+        """
+        Save the source digest index (write-then-rename).
+        """
+        if not self._digests_dirty:
+            return
+        path = self.cache_dir / _INDEX_NAME
+        try:
+            write_json_atomic(str(path), self._digests, indent=None)
+            self._digests_dirty = False
+        except Exception:
+            logger.warning("FrameCache source index write failed: %s", path, exc_info=True)
+
+    def _path(self, key: str) -> Path:
+        return entry_path(self.cache_dir, key)
+
+    def get(self, key: str | None) -> np.ndarray | None:
+        if key is None:
+            self.misses += 1
+            return None
+
+        path = self._path(key)
+        try:
+            arr = np.load(path, allow_pickle=False)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            logger.warning("FrameCache entry unreadable, dropping: %s", path, exc_info=True)
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        self.note_lookup(key, hit=True)
+        return arr
+
+    def note_lookup(self, key: str | None, hit: bool) -> None:
+        """
+        Count a lookup; a hit also refreshes the entry's LRU time. get() calls this
+        itself; call it for lookups done elsewhere (read_entry in a worker).
+        """
+        if not hit or key is None:
+            self.misses += 1
+            return
+
+        path = self._path(key)
+        # LRU touch (mtime carries the order across runs)
+        try:
+            os.utime(path)
+            size = path.stat().st_size
+            self._total += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+        except OSError:
+            pass
+
+        self.hits += 1
+
+    def put(self, key: str | None, frame: np.ndarray) -> None:
+        if key is None or frame is None:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp = path.with_name(f".{path.stem}.{uuid.uuid4().hex}.tmp.npy")
+        try:
+            np.save(tmp, np.ascontiguousarray(frame), allow_pickle=False)
+            os.replace(tmp, path)
+        except Exception:
+            logger.warning("FrameCache write failed: %s", path, exc_info=True)
+            tmp.unlink(missing_ok=True)
+            return
+
+        size = path.stat().st_size
+        self._total -= self._entries.pop(path, 0)
+        self._entries[path] = size
+        self._total += size
+
+        self._evict()
+
+    def _remove(self, path: Path) -> None:
+        self._total -= self._entries.pop(path, 0)
+        path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        # oldest first; O(1) per evicted entry
+        while self._total > self.max_bytes and self._entries:
+            path = next(iter(self._entries))
+            self._remove(path)
+            self.evictions += 1
+            logger.debug("FrameCache evicted %s", path)
+
+    def log_stats(self) -> None:
+        lookups = self.hits + self.misses
+        logger.info(
+            "FrameCache hits=%d misses=%d hit_rate=%.0f%% evictions=%d size=%.1fMB",
+            self.hits, self.misses, (100.0 * self.hits / lookups) if lookups else 0.0,
+            self.evictions, self._total / 1e6,
+        )
@@ -1,17 +1,68 @@
 import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator
+
 import numpy as np
 from PIL import Image, ImageOps
 
+from utils.hashing import file_sha256
+from utils.pool import init_worker_logging, safe_mp_context
+from .frame_cache import FrameCache, read_entry
+
 logger = logging.getLogger(__name__)
 
-def resize_image(image_path: str, target_size=(1920, 1080)) -> np.ndarray | None:
+# Processing parameters that affect the output pixels (part of every frame cache key)
+_RESAMPLE = Image.Resampling.LANCZOS
+_EXIF_MODE = "exif_transpose"
+
+
+def _cache_params(target_size) -> tuple:
+    return f"{target_size[0]}x{target_size[1]}", _RESAMPLE.name, _EXIF_MODE
+
+
+def _cache_key(cache, image_path: str, target_size) -> str | None:
+    return cache.key(image_path, *_cache_params(target_size))
+
+
+def _hash_and_resize(image_path: str, target_size, cache_dir: str) -> tuple:
+    """
+    Worker side of a cache lookup for an image the cache has no digest for: hash it
+    here (in parallel, not in the parent) and serve the frame from the cache if the
+    content is already there, else resize it.
+    Returns (sha256 or None, frame or None, hit).
+    """
+    try:
+        digest = file_sha256(image_path)
+    except OSError:
+        # unreadable: resize_image logs the failure
+        return None, resize_image(image_path, target_size), False
+    cached = read_entry(cache_dir, FrameCache.key_for(digest, *_cache_params(target_size)))
+    if cached is not None:
+        return digest, cached, True
+    return digest, resize_image(image_path, target_size), False
+
+
+def resize_image(image_path: str, target_size=(1920, 1080), cache=None) -> np.ndarray | None:
     """
     Resize an image to fill target_size while preserving aspect ratio,
     then center-crop/pad with black bars (letterbox) by pasting onto canvas.
 
+    cache: optional FrameCache; consulted before decoding and filled on success.
+
     Returns:
         np.ndarray (H, W, 3) in RGB, or None on failure.
     """
+    key = None
+    if cache is not None:
+        key = _cache_key(cache, image_path, target_size)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug("resize_image cache hit path=%s target=%s", image_path, target_size)
+            return cached
+
     try:
         # Open + handle EXIF rotation (common on phone photos)
         img = Image.open(image_path)
@@ -36,7 +87,7 @@ def resize_image(image_path: str, target_size=(1920, 1080)) -> np.ndarray | None
             new_width = target_size[0]
             new_height = int(round(new_width / img_ratio))
 
-        img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        img_resized = img.resize((new_width, new_height), _RESAMPLE)
 
         # Create canvas and paste centered (letterbox / pillarbox)
         canvas = Image.new("RGB", target_size, (0, 0, 0))
@@ -49,9 +100,243 @@ def resize_image(image_path: str, target_size=(1920, 1080)) -> np.ndarray | None
             image_path, img.size, img_resized.size, target_size, offset_x, offset_y
         )
 
-        return np.asarray(canvas)
+        frame = np.asarray(canvas)
+        if cache is not None:
+            cache.put(key, frame)
+        return frame
 
     except Exception:
         # exception() logs stacktrace automatically
         logger.exception("resize_image failed path=%s target=%s", image_path, target_size)
         return None
+
+
+def resize_images(
+    image_paths: Iterable[str],
+    target_size=(1920, 1080),
+    workers: int | None = None,
+    prefetch: int | None = None,
+    cache=None,
+) -> Iterator[tuple[str, np.ndarray | None]]:
+    """
+    Resize many images on a process pool, yielding (path, array_or_None) in input order.
+
+    Results are streamed: at most `prefetch` images (default 2 * workers) are in flight
+    or buffered at once, so the caller never holds every decoded frame at the same time.
+    Failures are reported like resize_image: logged per path, yielded as None.
+    workers <= 1 runs serially in this process.
+
+    cache: optional FrameCache. Images with a known digest are looked up here; the
+    others are hashed (and looked up) by the workers, so no file is read in full on
+    this serial path. Writes and hit/miss counters stay in this process.
+    """
+    workers = int(workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        for path in image_paths:
+            yield path, resize_image(path, target_size, cache=cache)
+        return
+
+    window = max(1, int(prefetch or workers * 2))
+    paths = iter(image_paths)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=safe_mp_context(),
+        initializer=init_worker_logging,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+    )
+    pending: deque = deque()
+
+    def _submit_next() -> None:
+        for path in paths:
+            key = None
+            digest = cache.known_digest(path) if cache is not None else None
+            if digest is not None:
+                key = cache.key_for(digest, *_cache_params(target_size))
+                cached = cache.get(key)
+                if cached is not None:
+                    fut = Future()
+                    fut.set_result(cached)
+                    pending.append((path, key, fut, True))
+                    return
+                fut = pool.submit(resize_image, path, target_size)
+            elif cache is not None:
+                # not hashed yet: the worker hashes it and checks the cache itself
+                fut = pool.submit(_hash_and_resize, path, target_size, str(cache.cache_dir))
+            else:
+                fut = pool.submit(resize_image, path, target_size)
+            pending.append((path, key, fut, False))
+            return
+
+    try:
+        for _ in range(window):
+            _submit_next()
+
+        logger.debug("resize_images pool started workers=%d window=%d", workers, window)
+
+        while pending:
+            path, key, fut, hit = pending.popleft()
+            worker_lookup = cache is not None and key is None
+            try:
+                img = fut.result()
+            except Exception:
+                # worker crashed or result could not be transferred
+                logger.exception("resize_image failed path=%s target=%s", path, target_size)
+                img = None
+
+            if worker_lookup:
+                digest, img, hit = img if img is not None else (None, None, False)
+                if digest is not None:
+                    cache.remember(path, digest)
+                    key = cache.key_for(digest, *_cache_params(target_size))
+                cache.note_lookup(key, hit)
+
+            if cache is not None and img is not None and not hit:
+                cache.put(key, img)
+
+            _submit_next()
+            yield path, img
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def image_readable(image_path: str) -> bool:
+    """
+    Cheap validity check: the header parses and has a non-empty size (pixels are not
+    decoded). Logs and returns False otherwise.
+    """
+    try:
+        with Image.open(image_path) as img:
+            if img.width > 0 and img.height > 0:
+                return True
+            logger.warning("Invalid image dimensions path=%s size=%s", image_path, img.size)
+    except Exception as e:
+        logger.warning("Unreadable image path=%s error=%s", image_path, e)
+    return False
+
+
+class SlideshowFrames:
+    """
+    Lazy frame source for a slideshow clip: frames(t) returns the resized image shown
+    at time t (image i covers [i * image_duration, (i + 1) * image_duration)).
+
+    An image is decoded/resized only when playback gets within `prefetch` images of it
+    (on a pool of `workers` threads; PIL releases the GIL while decoding and resampling)
+    and is dropped once playback moves past, so at most prefetch + 1 frames are resident
+    whatever the image count. prefetch is raised to workers - 1 when smaller, so the
+    window always holds one image per thread. Playback is expected to move forward (as an encoder
+    does); a backward seek just decodes that image again.
+
+    An image that fails to decode holds the previous frame (black for the first) so
+    the timeline stays in sync with the audio. Call close() when done.
+    """
+
+    def __init__(
+        self,
+        image_paths: list[str],
+        image_duration: float,
+        size=(1920, 1080),
+        prefetch: int = 2,
+        workers: int | None = None,
+        cache=None,
+    ):
+        if not image_paths:
+            raise ValueError("image_paths is empty")
+        if image_duration <= 0:
+            raise ValueError(f"Invalid image duration: {image_duration}")
+
+        self.paths = list(image_paths)
+        self.image_duration = float(image_duration)
+        self.duration = self.image_duration * len(self.paths)
+        self.size = tuple(size)
+        # decode threads come from `workers` (all cores by default, like the resize
+        # process pool); the window is widened to keep every one of them busy
+        threads = max(1, int(workers or os.cpu_count() or 1))
+        self.prefetch = max(0, int(prefetch), threads - 1)
+        self.cache = cache
+        self.decoded = 0
+        self.failed = 0
+
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="frames")
+        logger.info("SlideshowFrames threads=%d prefetch=%d", threads, self.prefetch)
+        # FrameCache bookkeeping is not thread-safe; serialize lookups/writes
+        self._cache_lock = threading.Lock()
+        self._pending: dict[int, Future] = {}
+        self._index = -1
+        self._frame: np.ndarray | None = None
+
+    def _resize(self, image_path: str) -> np.ndarray | None:
+        key = None
+        if self.cache is not None:
+            with self._cache_lock:
+                digest = self.cache.known_digest(image_path)
+            if digest is None:
+                # hashed outside the lock, so prefetch threads hash in parallel
+                try:
+                    digest = file_sha256(image_path)
+                except OSError:
+                    digest = None
+            with self._cache_lock:
+                if digest is not None:
+                    self.cache.remember(image_path, digest)
+                    key = self.cache.key_for(digest, *_cache_params(self.size))
+                cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        frame = resize_image(image_path, self.size)
+        if frame is not None and self.cache is not None:
+            with self._cache_lock:
+                self.cache.put(key, frame)
+        return frame
+
+    def _schedule(self, index: int) -> None:
+        """
+        Keep exactly images index .. index + prefetch queued or decoded.
+        """
+        last = min(len(self.paths) - 1, index + self.prefetch)
+        for i in [i for i in self._pending if i < index or i > last]:
+            self._pending.pop(i).cancel()
+        for i in range(index, last + 1):
+            if i not in self._pending:
+                self._pending[i] = self._pool.submit(self._resize, self.paths[i])
+
+    def _load(self, index: int) -> np.ndarray:
+        self._schedule(index)
+        try:
+            frame = self._pending.pop(index).result()
+        except Exception:
+            logger.exception("resize_image failed path=%s target=%s", self.paths[index], self.size)
+            frame = None
+        self.decoded += 1
+
+        if frame is None:
+            self.failed += 1
+            logger.warning("Holding previous frame for unreadable image: %s", self.paths[index])
+            if self._frame is not None:
+                return self._frame
+            return np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8)
+        return frame
+
+    def __call__(self, t: float) -> np.ndarray:
+        index = min(len(self.paths) - 1, max(0, int(t / self.image_duration)))
+        if index != self._index:
+            if index < self._index:
+                logger.debug("SlideshowFrames backward seek t=%.3f image=%d (was %d)", t, index, self._index)
+            self._frame = self._load(index)
+            self._index = index
+        return self._frame
+
+    def close(self) -> None:
+        for fut in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._frame = None
+        logger.info(
+            "SlideshowFrames closed images=%d decoded=%d failed=%d prefetch=%d",
+            len(self.paths), self.decoded, self.failed, self.prefetch,
+        )
+        if self.cache is not None:
+            self.cache.log_stats()
+            self.cache.flush()
@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+from typing import Callable, List, Tuple
+
+from utils.hashing import file_sha256
+from utils.manifest import BuildManifest, fingerprint
+from utils.timing import current_report, stage as timed_stage
+
+logger = logging.getLogger(__name__)
+
+
+class IncompleteStage(Exception):
+    """
+    Raised by a stage fn that wrote only part of its outputs. run_stage returns the
+    outputs that were written but does not record the stage, so the next run retries it.
+    """
+
+    def __init__(self, message: str, outputs: List[str]):
+        super().__init__(message)
+        self.outputs = list(outputs)
+
+
+def file_digests(paths: List[str]) -> List[Tuple[str, str]]:
+    """
+    (basename, content sha256) per input file, in order: renames, reorders and edits
+    all change a stage fingerprint, moving the folder does not.
+    """
+    return [(os.path.basename(p), file_sha256(p)) for p in paths]
+
+
+def run_stage(
+    manifest: BuildManifest,
+    name: str,
+    inputs: dict,
+    fn: Callable[[], List[str]],
+    force: bool = False,
+) -> Tuple[List[str], str]:
+    """
+    Run one pipeline stage unless the manifest says its outputs are up to date.
+
+    inputs: everything the stage's outputs depend on (file digests, parameters,
+        upstream stage fingerprints), as JSON-serializable values.
+    fn: does the work and returns the output paths it wrote, or raises
+        IncompleteStage when some of them could not be written.
+
+    A stale stage first deletes the outputs it recorded last time (targeted
+    invalidation instead of wiping whole folders), then reruns and records the
+    new fingerprint. Returns (outputs, fingerprint); downstream stages include the
+    fingerprint in their own inputs so a rerun propagates.
+    """
+    # JSON round trip so comparisons with the stored record see the same types
+    inputs = json.loads(json.dumps(inputs, default=str))
+    fp = fingerprint(inputs)
+
+    if not force and manifest.is_fresh(name, fp):
+        logger.info("Stage %s up to date fingerprint=%s; skipping", name, fp[:12])
+        report = current_report()
+        if report is not None:
+            report.meta.setdefault("skipped_stages", []).append(name)
+        return manifest.outputs(name), fp
+
+    previous = manifest.stages.get(name, {}).get("inputs") or {}
+    changed = sorted(k for k in set(inputs) | set(previous) if inputs.get(k) != previous.get(k))
+    logger.info(
+        "Stage %s rerun fingerprint=%s force=%s changed=%s",
+        name, fp[:12], force, changed if previous else "(no record)",
+    )
+
+    manifest.invalidate(name)
+    with timed_stage(name):
+        try:
+            outputs = fn()
+        except IncompleteStage as e:
+            logger.warning("Stage %s incomplete, not recorded (rerun retries it): %s", name, e)
+            return e.outputs, fp
+    manifest.record(name, fp, outputs, inputs=inputs)
+    return outputs, fp
@@ -1,14 +1,35 @@
 # pipeline/shorts_creator.py
+from __future__ import annotations
 
 import logging
 import os
-from typing import List, Tuple, Optional
-
-from moviepy import VideoFileClip
-from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Tuple, Optional
+
+from utils.pool import init_worker_logging, safe_mp_context
+from utils.timing import current_report, propagate, stage
+from .runner import IncompleteStage
+from .encoders import encoder_args, encoder_params, encoder_threads, resolve_encoder
+from .ffmpeg_utils import probe_keyframes, probe_video, run_ffmpeg
+
+# MoviePy (and the IPython stack it pulls in) is imported inside the MoviePy-engine
+# functions, so the ffmpeg engine and module import never pay for it
+if TYPE_CHECKING:
+    from moviepy import VideoFileClip
 
 logger = logging.getLogger(__name__)
 
+# Stream-copy seeks aim this far past the cut keyframe: keyframe times are rounded
+# (ffprobe prints 6 decimals), and a target even a microsecond early makes ffmpeg
+# seek to the previous keyframe, a whole GOP too soon
+COPY_SEEK_PAST_S = 0.001
+
+# Shorts per ffmpeg single-decode pass: every output holds its own encoder (frame
+# buffers, lookahead) and a failure in the pass loses all of them
+SINGLE_DECODE_GROUP = 4
+
 
 def _resize_clip(clip, *, width: Optional[int] = None, height: Optional[int] = None):
     """
@@ -71,6 +92,8 @@ def _fit_vertical_9_16(
     """
     FIT (no crop): keep whole frame, black bars possible.
     """
+    from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+
     scale = min(out_w / clip.w, out_h / clip.h)
     new_w = max(2, int(round(clip.w * scale)))
 
@@ -94,6 +117,8 @@ def _fill_vertical_9_16(
     FILL (cropping): cover full 9:16, no black bars.
     Uses CompositeVideoClip clipping (no crop() needed).
     """
+    from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+
     cover_scale = max(out_w / clip.w, out_h / clip.h)
 
     target_w = max(2, int(round(clip.w * cover_scale)))
@@ -127,6 +152,8 @@ def _fit_with_background(
     - foreground: fit (no crop)
     Result: no black bars + no important cutting
     """
+    from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+
     # background (fill)
     bg = _fill_vertical_9_16(
         clip,
@@ -157,6 +184,225 @@ def _fit_with_background(
     return comp
 
 
+def _build_vertical(
+    clip: VideoFileClip,
+    layout: str,
+    out_w: int,
+    out_h: int,
+    anchor_x: str,
+    anchor_y: str,
+) -> VideoFileClip:
+    layout_l = layout.lower().strip()
+    if layout_l == "fit":
+        return _fit_vertical_9_16(clip, out_w=out_w, out_h=out_h)
+    if layout_l == "fill":
+        return _fill_vertical_9_16(
+            clip, out_w=out_w, out_h=out_h, anchor_x=anchor_x, anchor_y=anchor_y
+        )
+    # default best
+    return _fit_with_background(
+        clip, out_w=out_w, out_h=out_h, anchor_x=anchor_x, anchor_y=anchor_y
+    )
+
+
+def _render_single_decode(
+    clip: VideoFileClip,
+    vertical: VideoFileClip,
+    jobs: List[Tuple[int, float, float, str]],
+    fps: int,
+    encoder: dict,
+) -> None:
+    """
+    Render every short from ONE sequential pass over the source.
+
+    Each output frame time is composited once (vertical.get_frame) and written to
+    every short whose range contains it; frames in gaps between ranges are never
+    composited. Each short gets its own encoder, opened when its range starts and
+    closed when it ends. Audio is cut per range to a temp AAC file and stream-copied
+    by the writer. A failure only drops the affected short.
+    """
+    from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+    writers: dict = {}
+    done: set = set()
+    threads = encoder_threads(encoder, os.cpu_count() or 4)
+
+    def _close(i: int) -> None:
+        writer = writers.pop(i, None)
+        done.add(i)
+        if writer is not None:
+            writer.close()
+
+    def _open(i: int, s: float, e: float, out_path: str) -> None:
+        logger.info("Rendering short%d range=%.2f..%.2f -> %s", i, s, e, out_path)
+        audiofile = None
+        if clip.audio is not None:
+            audiofile = os.path.join(tmp_dir, f"short{i}.m4a")
+            _subclip(clip.audio, s, e).write_audiofile(audiofile, codec="aac", logger=None)
+        writers[i] = FFMPEG_VideoWriter(
+            out_path,
+            vertical.size,
+            fps,
+            codec=encoder["codec"],
+            audiofile=audiofile,
+            preset=encoder["preset"],
+            threads=threads,
+            ffmpeg_params=encoder_params(encoder) + ["-movflags", "+faststart"],
+        )
+
+    if not jobs:
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix="shorts_audio_", dir=os.path.dirname(jobs[0][3]) or ".")
+    try:
+        lo = min(s for _, s, _, _ in jobs)
+        hi = max(e for _, _, e, _ in jobs)
+        n_frames = int((hi - lo) * fps)
+        logger.info("Single-decode pass span=%.2f..%.2f frames=%d shorts=%d", lo, hi, n_frames, len(jobs))
+
+        for k in range(n_frames):
+            t = lo + k / fps
+            active = []
+            for i, s, e, out_path in jobs:
+                if i in done:
+                    continue
+                if t >= e:
+                    _close(i)
+                    logger.info("Rendered %s OK", out_path)
+                elif t >= s:
+                    active.append((i, s, e, out_path))
+            if not active:
+                continue
+
+            frame = vertical.get_frame(t)
+            for i, s, e, out_path in active:
+                try:
+                    if i not in writers:
+                        _open(i, s, e, out_path)
+                    writers[i].write_frame(frame)
+                except Exception:
+                    logger.exception("Failed rendering short%d", i)
+                    try:
+                        _close(i)
+                    except Exception:
+                        pass
+                    _discard_partial(out_path)
+
+        # shorts that run to the end of the span
+        for i, _, _, out_path in jobs:
+            if i in writers:
+                try:
+                    _close(i)
+                    logger.info("Rendered %s OK", out_path)
+                except Exception:
+                    logger.exception("Failed rendering short%d", i)
+                    _discard_partial(out_path)
+    finally:
+        # writers still open here were cut short by an exception
+        for i, _, _, out_path in jobs:
+            if i in writers:
+                try:
+                    _close(i)
+                except Exception:
+                    pass
+                _discard_partial(out_path)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _write_short(vertical, s: float, e: float, out_path: str, fps: int, encoder: dict, threads: int) -> None:
+    sub = None
+    try:
+        sub = _subclip(vertical, s, e)
+        sub.write_videofile(
+            out_path,
+            codec=encoder["codec"],
+            audio_codec="aac",
+            fps=fps,
+            threads=encoder_threads(encoder, threads),
+            preset=encoder["preset"],
+            ffmpeg_params=encoder_params(encoder) + ["-movflags", "+faststart"],
+            logger=None,
+        )
+    finally:
+        try:
+            if sub is not None:
+                sub.close()
+        except Exception:
+            pass
+
+
+def _render_short_worker(
+    video_path: str,
+    i: int,
+    s: float,
+    e: float,
+    out_path: str,
+    layout: str,
+    out_w: int,
+    out_h: int,
+    anchor_x: str,
+    anchor_y: str,
+    fps: int,
+    encoder: dict,
+    threads: int,
+) -> dict:
+    """
+    Process-pool job: open the source, build the layout and render one short.
+    Exceptions propagate to the parent, which logs them per short. Returns the
+    short's stage record (see utils.timing.stage) for the parent's run report.
+    """
+    from moviepy import VideoFileClip
+
+    logger.info("Rendering short%d range=%.2f..%.2f -> %s (threads=%d)", i, s, e, out_path, threads)
+    with VideoFileClip(video_path) as clip:
+        vertical = _build_vertical(clip, layout, out_w, out_h, anchor_x, anchor_y)
+        with stage(f"short{i}") as rec:
+            _write_short(vertical, s, e, out_path, fps=fps, encoder=encoder, threads=threads)
+    return rec
+
+
+def _render_parallel(
+    video_path: str,
+    jobs: List[Tuple[int, float, float, str]],
+    workers: int,
+    **layout_opts,
+) -> None:
+    """
+    Render independent ranges in separate processes. The CPU budget is split evenly:
+    each worker's x264 gets cpu_count // workers threads (x264 scales poorly past a
+    handful of threads at 1080x1920, so several narrow encoders beat one wide one).
+    Results are reported in range order; one failing short never affects the others.
+    """
+    workers = max(1, min(int(workers), len(jobs)))
+    threads = max(1, (os.cpu_count() or 4) // workers)
+    logger.info("Rendering %d shorts on %d processes threads_per_short=%d", len(jobs), workers, threads)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=safe_mp_context(),
+        initializer=init_worker_logging,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+    ) as pool:
+        futures = [
+            (i, out_path, pool.submit(
+                _render_short_worker, video_path, i, s, e, out_path, threads=threads, **layout_opts
+            ))
+            for i, s, e, out_path in jobs
+        ]
+        for i, out_path, fut in futures:
+            try:
+                rec = fut.result()
+                logger.info("Rendered %s OK", out_path)
+            except Exception:
+                logger.exception("Failed rendering short%d", i)
+                _discard_partial(out_path)
+                continue
+            # measured in the worker process; the parent's report has no other view of it
+            report = current_report()
+            if report is not None:
+                report.add(rec)
+
+
 def _build_start_ranges(duration: float, short_len: float, count: Optional[int], gap: float) -> List[Tuple[float, float]]:
     ranges: List[Tuple[float, float]] = []
     start = 0.0
@@ -172,6 +418,413 @@ def _build_start_ranges(duration: float, short_len: float, count: Optional[int],
     return ranges
 
 
+def planned_cut_times(
+    duration: float,
+    short_len: float = 30.0,
+    count: Optional[int] = None,
+    gap: float = 0.0,
+) -> List[float]:
+    """
+    Every start/end of the "start"-mode shorts ranges for a video of this duration.
+    Known before the long video is encoded, so they can be forced as keyframes.
+    """
+    times = set()
+    for s, e in _build_start_ranges(duration, short_len=short_len, count=count, gap=gap):
+        times.add(round(s, 3))
+        if e < duration:
+            times.add(round(e, 3))
+    return sorted(times)
+
+
+def _keyframes_aligned(
+    keyframes: List[float],
+    jobs: List[Tuple[int, float, float, str]],
+    duration: float,
+    tol: float = 0.05,
+) -> bool:
+    """
+    True when every range boundary (except the video end) sits on a keyframe,
+    i.e. the base video was encoded with planned_cut_times as forced keyframes.
+    """
+    if not keyframes:
+        return False
+    for _, s, e, _ in jobs:
+        for t in (s, e):
+            if t >= duration - tol:
+                continue
+            if min(abs(k - t) for k in keyframes) > tol:
+                return False
+    return True
+
+
+def _build_jobs(
+    duration: float,
+    shorts_dir: str,
+    mode: str,
+    short_len: float,
+    count: Optional[int],
+    gap: float,
+    manual_ranges: Optional[List[Tuple[float, float]]],
+) -> List[Tuple[int, float, float, str]]:
+    """
+    Resolve the short ranges into (index, start, end, out_path) jobs clamped to the video.
+    """
+    # Ranges (start mode only here)
+    if mode == "manual":
+        ranges = manual_ranges or []
+    else:
+        ranges = _build_start_ranges(duration, short_len=short_len, count=count, gap=gap)
+
+    if not ranges:
+        logger.warning("No valid ranges generated. Nothing to render.")
+        return []
+
+    logger.info("Short ranges=%s", ranges)
+
+    jobs: List[Tuple[int, float, float, str]] = []
+    for i, (start, end) in enumerate(ranges, start=1):
+        s = max(0.0, float(start))
+        e = min(duration, float(end))
+        if e <= s:
+            logger.warning("Skipping short%d (invalid range start=%.2f end=%.2f)", i, s, e)
+            continue
+        jobs.append((i, s, e, os.path.join(shorts_dir, f"short{i}.mp4")))
+    return jobs
+
+
+def _discard_partial(out_path: str) -> None:
+    # a failed short may leave a truncated file that would be reported as written
+    try:
+        if os.path.isfile(out_path):
+            os.remove(out_path)
+    except OSError:
+        logger.warning("Failed to delete partial short: %s", out_path, exc_info=True)
+
+
+def _written(jobs: List[Tuple[int, float, float, str]], require_all: bool = False) -> List[str]:
+    """
+    Output paths of the jobs that were written. require_all=True raises IncompleteStage
+    (carrying those paths) when any short is missing.
+    """
+    written = [out_path for _, _, _, out_path in jobs if os.path.exists(out_path)]
+    if require_all and len(written) < len(jobs):
+        missing = [out_path for _, _, _, out_path in jobs if out_path not in written]
+        raise IncompleteStage(f"{len(missing)} of {len(jobs)} shorts not written: {missing}", written)
+    return written
+
+
+def _same_aspect(w: int, h: int, out_w: int, out_h: int, tol: float = 0.01) -> bool:
+    """
+    True when w x h has the out_w x out_h aspect ratio, allowing for encoder rounding
+    (e.g. 1088x1920 or 720x1280 for 1080x1920).
+    """
+    if w <= 0 or h <= 0 or out_w <= 0 or out_h <= 0:
+        return False
+    return abs((w / h) / (out_w / out_h) - 1.0) <= tol
+
+
+def _even(value: float) -> int:
+    # yuv420p needs even dimensions
+    return max(2, int(round(value)) // 2 * 2)
+
+
+def _ffmpeg_layout_graph(
+    layout: str,
+    src_w: int,
+    src_h: int,
+    out_w: int = 1080,
+    out_h: int = 1920,
+    anchor_x: str = "center",
+    anchor_y: str = "center",
+    dim: float = 0.35,
+    src: str = "[0:v]",
+) -> str:
+    """
+    ffmpeg filter graph (src -> [v]) equivalent to the MoviePy layouts:
+    - fit:    scale to fit + pad with black
+    - fill:   scale to cover + crop at the anchor
+    - fit_bg: split; cover+crop+dim background, fit foreground, overlay centered
+    Sizes/offsets are computed exactly like _fit_vertical_9_16/_fill_vertical_9_16,
+    rounded to even values for yuv420p.
+    """
+    fit_scale = min(out_w / src_w, out_h / src_h)
+    fit_w = min(out_w, _even(src_w * fit_scale))
+    fit_h = min(out_h, _even(src_h * fit_w / src_w))
+    fit_x = (out_w - fit_w) // 2
+    fit_y = (out_h - fit_h) // 2
+
+    cover_scale = max(out_w / src_w, out_h / src_h)
+    cover_w = max(out_w, _even(src_w * cover_scale))
+    cover_h = max(out_h, _even(src_h * cover_w / src_w))
+    crop_x = -_anchor_offset(out_w, cover_w, anchor_x)
+    crop_y = -_anchor_offset(out_h, cover_h, anchor_y)
+
+    fill = f"scale={cover_w}:{cover_h},crop={out_w}:{out_h}:{crop_x}:{crop_y}"
+    fit = f"scale={fit_w}:{fit_h}"
+
+    layout_l = layout.lower().strip()
+    if layout_l == "fit":
+        return f"{src}{fit},pad={out_w}:{out_h}:{fit_x}:{fit_y}:black,setsar=1[v]"
+    if layout_l == "fill":
+        return f"{src}{fill},setsar=1[v]"
+    # default best: dimmed fill background + fitted foreground.
+    # Dimming = RGB * dim, done as a YUV lookup table (limited range) to avoid an RGB round trip.
+    dimmer = (
+        f"lutyuv=y=16+(val-16)*{dim}:u=128+(val-128)*{dim}:v=128+(val-128)*{dim}"
+    )
+    return (
+        f"{src}split=2[bgsrc][fgsrc];"
+        f"[bgsrc]{fill},{dimmer}[bg];"
+        f"[fgsrc]{fit}[fg];"
+        f"[bg][fg]overlay={fit_x}:{fit_y},setsar=1[v]"
+    )
+
+
+def _ffmpeg_encode_args(fps: int, encoder: dict, threads: int) -> List[str]:
+    return [
+        "-r", str(fps),
+        *encoder_args(encoder, threads=threads),
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-movflags", "+faststart",
+    ]
+
+
+def _ffmpeg_seek_args(t: float) -> List[str]:
+    # Input seek to the keyframe at or before t, keeping every frame from there: the
+    # default accurate seek drops frames timestamped before t, including a still of a
+    # VFR slideshow that is on screen at t (the short would open on the next picture).
+    # Timestamps stay relative to t, so frames before it are negative and trimmed.
+    # This is the fast seek with or without keyframe alignment: decoding starts at that
+    # keyframe, which is t itself when the cut was forced as a keyframe (see
+    # planned_cut_times), so nothing before the cut is decoded. Otherwise the preroll is
+    # decoded and trimmed, as an accurate seek would decode it too.
+    return ["-ss", f"{t:.3f}", "-noaccurate_seek"]
+
+
+def _ffmpeg_cut_chain(fps: int, start: float, end: float) -> str:
+    # constant-rate frames first, so trim cuts on a regular grid even for VFR sources
+    return f"fps={fps},trim=start={start:.3f}:end={end:.3f},setpts=PTS-STARTPTS"
+
+
+def _ffmpeg_render_short(
+    video_path: str,
+    graph: str,
+    s: float,
+    e: float,
+    out_path: str,
+    fps: int,
+    encoder: dict,
+    threads: int,
+    has_audio: bool,
+) -> str:
+    parts = [f"[0:v]{_ffmpeg_cut_chain(fps, 0.0, e - s)}[src]", graph]
+    maps = ["-map", "[v]"]
+    if has_audio:
+        parts.append(f"[0:a]atrim=start=0:end={e - s:.3f},asetpts=PTS-STARTPTS[a]")
+        maps += ["-map", "[a]"]
+    cmd = [
+        "ffmpeg", "-y",
+        *_ffmpeg_seek_args(s), "-i", video_path,
+        "-filter_complex", ";".join(parts),
+        *maps,
+        *_ffmpeg_encode_args(fps, encoder, threads),
+        out_path,
+    ]
+    with stage(os.path.splitext(os.path.basename(out_path))[0]):
+        run_ffmpeg(cmd, what=f"short {os.path.basename(out_path)}")
+    return out_path
+
+
+def _ffmpeg_render_single_decode(
+    video_path: str,
+    graph: str,
+    jobs: List[Tuple[int, float, float, str]],
+    has_audio: bool,
+    fps: int,
+    encoder: dict,
+) -> None:
+    """
+    One ffmpeg process for all shorts: decode the covered span once, apply the layout
+    once, then split/trim the result into one output file per range.
+    """
+    lo = min(s for _, s, _, _ in jobs)
+    hi = max(e for _, _, e, _ in jobs)
+    n = len(jobs)
+
+    parts = [
+        f"[0:v]{_ffmpeg_cut_chain(fps, 0.0, hi - lo)}[src]",
+        graph,
+        f"[v]split={n}" + "".join(f"[vs{k}]" for k in range(n)),
+    ]
+    if has_audio:
+        parts.append(f"[0:a]asplit={n}" + "".join(f"[as{k}]" for k in range(n)))
+
+    outputs: List[str] = []
+    # every output runs its own encoder: split the CPU budget between them
+    threads = max(1, (os.cpu_count() or 4) // n)
+    for k, (i, s, e, out_path) in enumerate(jobs):
+        rs, re_ = s - lo, e - lo
+        parts.append(f"[vs{k}]trim=start={rs:.3f}:end={re_:.3f},setpts=PTS-STARTPTS[vo{k}]")
+        outputs += ["-map", f"[vo{k}]"]
+        if has_audio:
+            parts.append(f"[as{k}]atrim=start={rs:.3f}:end={re_:.3f},asetpts=PTS-STARTPTS[ao{k}]")
+            outputs += ["-map", f"[ao{k}]"]
+        outputs += [*_ffmpeg_encode_args(fps, encoder, threads), out_path]
+
+    cmd = [
+        "ffmpeg", "-y",
+        *_ffmpeg_seek_args(lo), "-i", video_path,
+        "-filter_complex", ";".join(parts),
+        *outputs,
+    ]
+    logger.info("Single-decode ffmpeg pass span=%.2f..%.2f shorts=%d threads_per_short=%d", lo, hi, n, threads)
+    with stage("shorts_single_decode"):
+        run_ffmpeg(cmd, what="shorts single-decode")
+
+
+def _create_shorts_ffmpeg(
+    video_path: str,
+    jobs: List[Tuple[int, float, float, str]],
+    info: dict,
+    layout: str,
+    out_w: int,
+    out_h: int,
+    anchor_x: str,
+    anchor_y: str,
+    fps: int,
+    encoder: dict,
+    single_decode: bool,
+    workers: int,
+) -> None:
+    graph = _ffmpeg_layout_graph(
+        layout, info["width"], info["height"], out_w=out_w, out_h=out_h,
+        anchor_x=anchor_x, anchor_y=anchor_y, src="[src]",
+    )
+    logger.info("FFmpeg layout graph: %s", graph)
+
+    failed: List[str] = []
+    if single_decode and workers <= 1:
+        for g in range(0, len(jobs), SINGLE_DECODE_GROUP):
+            group = jobs[g:g + SINGLE_DECODE_GROUP]
+            try:
+                _ffmpeg_render_single_decode(
+                    video_path, graph, group, has_audio=info["has_audio"], fps=fps, encoder=encoder
+                )
+                for _, _, _, out_path in group:
+                    logger.info("Rendered %s OK", out_path)
+            except Exception:
+                logger.warning(
+                    "Single-decode pass failed for %s; rendering them one by one",
+                    [out_path for _, _, _, out_path in group], exc_info=True,
+                )
+                failed += _ffmpeg_render_each(video_path, graph, group, info["has_audio"], fps, encoder, workers=1)
+    else:
+        failed = _ffmpeg_render_each(video_path, graph, jobs, info["has_audio"], fps, encoder, workers)
+    if failed:
+        logger.error("Failed shorts: %s", failed)
+
+
+def _ffmpeg_render_each(
+    video_path: str,
+    graph: str,
+    jobs: List[Tuple[int, float, float, str]],
+    has_audio: bool,
+    fps: int,
+    encoder: dict,
+    workers: int,
+) -> List[str]:
+    """
+    Render each short in its own ffmpeg process, `workers` at a time.
+    Returns the output paths that failed.
+    """
+    # threads are enough to drive the ffmpeg processes in parallel
+    workers = max(1, min(int(workers), len(jobs)))
+    threads = max(1, (os.cpu_count() or 4) // workers)
+    failed: List[str] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="short") as pool:
+        futures = []
+        for i, s, e, out_path in jobs:
+            logger.info("Rendering short%d range=%.2f..%.2f -> %s", i, s, e, out_path)
+            futures.append((i, out_path, pool.submit(
+                propagate(_ffmpeg_render_short), video_path, graph, s, e, out_path, fps, encoder, threads,
+                has_audio,
+            )))
+        for i, out_path, fut in futures:
+            try:
+                fut.result()
+                logger.info("Rendered %s OK", out_path)
+            except Exception:
+                logger.exception("Failed rendering short%d", i)
+                failed.append(out_path)
+                _discard_partial(out_path)
+    return failed
+
+
+def _snap_to_keyframes(
+    s: float,
+    e: float,
+    keyframes: List[float],
+    duration: float,
+) -> Tuple[float, float]:
+    """
+    Move a range onto keyframe boundaries (the only exact cut points for stream copy):
+    start -> nearest keyframe, end -> nearest keyframe after the start (or the video end).
+    """
+    if not keyframes:
+        return s, e
+    ks = min(keyframes, key=lambda k: abs(k - s))
+    ends = [k for k in keyframes if k > ks] + [duration]
+    ke = min(ends, key=lambda k: abs(k - e))
+    return ks, ke
+
+
+def _create_shorts_copy(
+    video_path: str,
+    jobs: List[Tuple[int, float, float, str]],
+    duration: float,
+    keyframes: List[float],
+) -> None:
+    """
+    Lossless fast path: cut each range with stream copy (no decode, no re-encode).
+    Boundaries always snap to the nearest keyframes, the only places a copy can cut,
+    and the per-short snap delta is logged. When the base video was encoded with the
+    cut points as forced keyframes (aligned), the deltas are under the check's 50 ms.
+    """
+    aligned = _keyframes_aligned(keyframes, jobs, duration)
+    logger.info("Stream-copy cuts keyframes=%d aligned=%s", len(keyframes), aligned)
+
+    for i, s, e, out_path in jobs:
+        ks, ke = _snap_to_keyframes(s, e, keyframes, duration)
+        logger.info(
+            "Cutting short%d range=%.2f..%.2f snapped=%.2f..%.2f delta_start=%+.3fs delta_end=%+.3fs -> %s",
+            i, s, e, ks, ke, ks - s, ke - e, out_path,
+        )
+        if ke <= ks:
+            logger.warning("Skipping short%d (no keyframe-aligned range near %.2f..%.2f)", i, s, e)
+            continue
+
+        # input timestamps are relative to the seek target, so the duration is shortened
+        # by the same margin to stop before the keyframe at ke
+        cmd = [
+            "ffmpeg", "-y",
+            "-ss", f"{ks + COPY_SEEK_PAST_S:.6f}", "-i", video_path,
+            "-t", f"{ke - ks - COPY_SEEK_PAST_S:.6f}",
+            "-map", "0:v:0", "-map", "0:a?",
+            "-c", "copy",
+            "-avoid_negative_ts", "make_zero",
+            "-movflags", "+faststart",
+            out_path,
+        ]
+        try:
+            with stage(f"short{i}"):
+                run_ffmpeg(cmd, what=f"stream copy short{i}")
+            logger.info("Rendered %s OK", out_path)
+        except Exception:
+            logger.exception("Failed rendering short%d", i)
+            _discard_partial(out_path)
+
+
 def create_shorts(
     video_path: str,
     shorts_dir: str = "shorts",
@@ -187,7 +840,42 @@ def create_shorts(
     anchor_x: str = "center",     # left/center/right
     anchor_y: str = "center",     # top/center/bottom
     manual_ranges: Optional[List[Tuple[float, float]]] = None,
+    single_decode: bool = False,
+    workers: int = 1,
+    engine: str = "moviepy",
+    stream_copy: bool = False,
+    encoder: dict | None = None,
+    require_all: bool = False,
 ):
+    """
+    Cut vertical shorts out of video_path.
+
+    single_decode=True renders all ranges from one sequential decode of the source
+    (layout applied once per frame, frames fanned out to per-short encoders) instead
+    of re-seeking and re-decoding the source for every short.
+
+    workers > 1 renders ranges in that many processes, each with a slice of the CPU
+    budget for x264 (takes precedence over single_decode, which is a one-process mode).
+
+    engine="ffmpeg" skips MoviePy entirely: each layout/anchor becomes an ffmpeg filter
+    graph (split/scale/crop/lutyuv/overlay), so the per-pixel work runs in
+    ffmpeg's SIMD code. single_decode and workers apply to it as well; its single-decode
+    passes cover SINGLE_DECODE_GROUP shorts each, and the shorts of a failed pass are
+    rendered again one by one.
+
+    stream_copy=True skips the layout entirely and cuts each range losslessly with
+    ffmpeg stream copy (horizontal cuts, or sources that are already vertical), snapping
+    range boundaries to the nearest keyframes. The ffmpeg engine also takes this path
+    automatically when the source already has the out_w x out_h aspect ratio (its
+    own resolution is kept).
+
+    encoder: the "shorts" stage of a render profile (see config.RENDER_PROFILES);
+    None = libx264 with `preset`.
+
+    Returns the paths of the shorts that were written. A failed short leaves no file
+    behind; with require_all=True any missing short raises runner.IncompleteStage
+    (carrying the written paths) instead, so a pipeline stage is not recorded as done.
+    """
     os.makedirs(shorts_dir, exist_ok=True)
 
     logger.info(
@@ -197,6 +885,50 @@ def create_shorts(
 
     if not os.path.isfile(video_path):
         raise FileNotFoundError(video_path)
+    if engine not in ("moviepy", "ffmpeg"):
+        raise ValueError(f"Unknown engine: {engine} (expected 'moviepy' or 'ffmpeg')")
+
+    if engine == "ffmpeg":
+        binary = "ffmpeg"
+    else:
+        from moviepy.config import FFMPEG_BINARY as binary
+    settings = resolve_encoder(encoder, preset, binary=binary)
+    logger.info("Shorts encoder codec=%s preset=%s crf=%s", settings["codec"], settings["preset"], settings.get("crf"))
+
+    if engine == "ffmpeg" or stream_copy:
+        info = probe_video(video_path)
+        duration = info["duration"]
+        logger.info(
+            "Probed video duration=%.2fs size=%dx%d fps=%.2f audio=%s",
+            duration, info["width"], info["height"], info["fps"], info["has_audio"],
+        )
+        if duration <= 0:
+            raise ValueError(f"Invalid video duration: {duration}")
+
+        jobs = _build_jobs(
+            duration, shorts_dir, mode=mode, short_len=short_len, count=count, gap=gap,
+            manual_ranges=manual_ranges,
+        )
+        if jobs and not stream_copy and _same_aspect(info["width"], info["height"], out_w, out_h):
+            logger.info(
+                "Source %dx%d already has the %dx%d aspect ratio; using stream copy (source size kept)",
+                info["width"], info["height"], out_w, out_h,
+            )
+            stream_copy = True
+
+        if jobs and stream_copy:
+            # only stream copy needs keyframe positions (a full packet scan)
+            _create_shorts_copy(video_path, jobs, duration, probe_keyframes(video_path))
+        elif jobs:
+            _create_shorts_ffmpeg(
+                video_path, jobs, info, layout=layout, out_w=out_w, out_h=out_h,
+                anchor_x=anchor_x, anchor_y=anchor_y, fps=fps, encoder=settings,
+                single_decode=single_decode, workers=workers,
+            )
+        logger.info("create_shorts completed")
+        return _written(jobs, require_all)
+
+    from moviepy import VideoFileClip
 
     with VideoFileClip(video_path) as clip:
         duration = float(clip.duration or 0.0)
@@ -208,64 +940,39 @@ def create_shorts(
             raise ValueError(f"Invalid video duration: {duration}")
 
         # Build vertical base clip
-        layout_l = layout.lower().strip()
-        if layout_l == "fit":
-            vertical = _fit_vertical_9_16(clip, out_w=out_w, out_h=out_h)
-        elif layout_l == "fill":
-            vertical = _fill_vertical_9_16(
-                clip, out_w=out_w, out_h=out_h, anchor_x=anchor_x, anchor_y=anchor_y
-            )
-        else:
-            # default best
-            vertical = _fit_with_background(
-                clip, out_w=out_w, out_h=out_h, anchor_x=anchor_x, anchor_y=anchor_y
-            )
+        vertical = _build_vertical(clip, layout, out_w, out_h, anchor_x, anchor_y)
 
         logger.info("Prepared vertical clip size=%dx%d", vertical.w, vertical.h)
 
-        # Ranges (start mode only here)
-        if mode == "manual":
-            ranges = manual_ranges or []
+        jobs = _build_jobs(
+            duration, shorts_dir, mode=mode, short_len=short_len, count=count, gap=gap,
+            manual_ranges=manual_ranges,
+        )
+        if not jobs:
+            return []
+
+        # MoviePy's reader always seeks to t-1s and decodes the last second (no hook to
+        # change it), so forced keyframes do not shorten its seeks; single_decode avoids
+        # re-seeking altogether
+        if workers > 1 and len(jobs) > 1:
+            _render_parallel(
+                video_path, jobs, workers,
+                layout=layout, out_w=out_w, out_h=out_h, anchor_x=anchor_x, anchor_y=anchor_y,
+                fps=fps, encoder=settings,
+            )
+        elif single_decode:
+            with stage("shorts_single_decode"):
+                _render_single_decode(clip, vertical, jobs, fps=fps, encoder=settings)
         else:
-            ranges = _build_start_ranges(duration, short_len=short_len, count=count, gap=gap)
-
-        if not ranges:
-            logger.warning("No valid ranges generated. Nothing to render.")
-            return
-
-        logger.info("Short ranges=%s", ranges)
-
-        for i, (start, end) in enumerate(ranges, start=1):
-            s = max(0.0, float(start))
-            e = min(duration, float(end))
-            if e <= s:
-                logger.warning("Skipping short%d (invalid range start=%.2f end=%.2f)", i, s, e)
-                continue
-
-            out_path = os.path.join(shorts_dir, f"short{i}.mp4")
-            logger.info("Rendering short%d range=%.2f..%.2f -> %s", i, s, e, out_path)
-
-            sub = None
-            try:
-                sub = _subclip(vertical, s, e)
-                sub.write_videofile(
-                    out_path,
-                    codec="libx264",
-                    audio_codec="aac",
-                    fps=fps,
-                    threads=os.cpu_count() or 4,
-                    preset=preset,
-                    ffmpeg_params=["-movflags", "+faststart"],
-                    logger=None,
-                )
-                logger.info("Rendered %s OK", out_path)
-            except Exception:
-                logger.exception("Failed rendering short%d", i)
-            finally:
+            for i, s, e, out_path in jobs:
+                logger.info("Rendering short%d range=%.2f..%.2f -> %s", i, s, e, out_path)
                 try:
-                    if sub is not None:
-                        sub.close()
+                    with stage(f"short{i}"):
+                        _write_short(vertical, s, e, out_path, fps=fps, encoder=settings, threads=os.cpu_count() or 4)
+                    logger.info("Rendered %s OK", out_path)
                 except Exception:
-                    pass
+                    logger.exception("Failed rendering short%d", i)
+                    _discard_partial(out_path)
 
     logger.info("create_shorts completed")
+    return _written(jobs, require_all)
@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable
+
+from utils.jsonio import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Job handler: (job_id, spec, progress) -> result dict stored in the job's status file.
+# progress(stage) records the stage the job is in.
+Handler = Callable[[str, dict, Callable[[str], None]], dict]
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _pid_alive(pid) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+class SpoolQueue:
+    """
+    Job queue kept in a plain directory, so producers only need to drop a JSON file:
+
+        incoming/<id>.json       queued job specs (picked oldest name first)
+        running/<id>@<pid>.json  claimed by the worker process <pid>
+        done/, failed/           finished specs
+        status/<id>.json         state, stage, timestamps, outputs or error
+
+    Claiming is an atomic rename that also records the worker's pid, so several
+    workers can share one spool and recover() never mistakes a job that was just
+    claimed for an orphan.
+    Write specs to a temp name that does not end in .json and rename them in (see submit).
+    """
+
+    DIRS = ("incoming", "running", "done", "failed", "status")
+
+    def __init__(self, root: str):
+        self.root = root
+        for d in self.DIRS:
+            os.makedirs(os.path.join(root, d), exist_ok=True)
+        self._status_lock = threading.Lock()
+
+    def _path(self, box: str, job_id: str) -> str:
+        return os.path.join(self.root, box, f"{job_id}.json")
+
+    def _running_path(self, job_id: str, pid: int | None = None) -> str:
+        return os.path.join(self.root, "running", f"{job_id}@{os.getpid() if pid is None else pid}.json")
+
+    def submit(self, spec: dict, job_id: str | None = None) -> str:
+        """
+        Queue a job spec; returns its id (time-ordered unless given).
+        """
+        job_id = job_id or f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        # the temp name does not end in .json, so claim() never picks up a partial spec
+        write_json_atomic(self._path("incoming", job_id), spec)
+        self.set_status(job_id, state="queued", queued=_now())
+        return job_id
+
+    def status(self, job_id: str) -> dict:
+        try:
+            with open(self._path("status", job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def set_status(self, job_id: str, **fields) -> dict:
+        with self._status_lock:
+            data = self.status(job_id)
+            data.update(fields, id=job_id, updated=_now())
+            write_json_atomic(self._path("status", job_id), data)
+            return data
+
+    def recover(self) -> int:
+        """
+        Requeue running jobs whose worker process is gone (crash, kill -9).
+        """
+        n = 0
+        running = os.path.join(self.root, "running")
+        for name in sorted(os.listdir(running)):
+            if not name.endswith(".json"):
+                continue
+            job_id, sep, pid = name[:-len(".json")].rpartition("@")
+            if not sep:
+                # claimed before pids were part of the name
+                job_id, pid = pid, self.status(pid).get("pid")
+            if _pid_alive(pid):
+                continue
+            try:
+                os.replace(os.path.join(running, name), self._path("incoming", job_id))
+            except FileNotFoundError:
+                continue
+            self.set_status(job_id, state="queued", requeued=_now())
+            logger.warning("Requeued orphaned job %s", job_id)
+            n += 1
+        return n
+
+    def claim(self) -> tuple[str, dict] | None:
+        """
+        Move the oldest queued spec to running/ and return (job_id, spec), or None.
+        Unreadable specs are moved straight to failed/.
+        """
+        incoming = os.path.join(self.root, "incoming")
+        for name in sorted(os.listdir(incoming)):
+            if not name.endswith(".json"):
+                continue
+            job_id = name[:-len(".json")]
+            try:
+                os.replace(self._path("incoming", job_id), self._running_path(job_id))
+            except FileNotFoundError:
+                continue  # another worker got it
+
+            try:
+                with open(self._running_path(job_id), "r", encoding="utf-8") as f:
+                    spec = json.load(f)
+                if not isinstance(spec, dict):
+                    raise ValueError("job spec must be a JSON object")
+            except Exception as e:
+                logger.error("Invalid job spec %s: %s", job_id, e)
+                self.finish(job_id, ok=False, error=f"invalid spec: {e}")
+                continue
+
+            self.set_status(job_id, state="running", started=_now(), pid=os.getpid(), stage="claimed")
+            return job_id, spec
+        return None
+
+    def finish(self, job_id: str, ok: bool, **fields) -> None:
+        box = "done" if ok else "failed"
+        try:
+            os.replace(self._running_path(job_id), self._path(box, job_id))
+        except FileNotFoundError:
+            logger.warning("Job spec %s vanished from running/", job_id)
+        self.set_status(job_id, state=box, finished=_now(), **fields)
+
+
+def _run_job(queue: SpoolQueue, handler: Handler, job_id: str, spec: dict) -> bool:
+    t0 = time.perf_counter()
+    logger.info("Job start id=%s", job_id)
+
+    def progress(stage: str) -> None:
+        queue.set_status(job_id, stage=stage, elapsed=round(time.perf_counter() - t0, 2))
+
+    try:
+        result = handler(job_id, spec, progress)
+    except Exception as e:
+        logger.exception("Job failed id=%s", job_id)
+        queue.finish(job_id, ok=False, error=str(e) or type(e).__name__,
+                     elapsed=round(time.perf_counter() - t0, 2))
+        return False
+
+    elapsed = time.perf_counter() - t0
+    queue.finish(job_id, ok=True, stage="done", result=result, elapsed=round(elapsed, 2))
+    logger.info("Job done id=%s elapsed=%.2fs", job_id, elapsed)
+    return True
+
+
+def serve(
+    queue: SpoolQueue,
+    handler: Handler,
+    concurrency: int = 1,
+    once: bool = False,
+    poll: float = 2.0,
+    stop: threading.Event | None = None,
+) -> dict:
+    """
+    Worker loop: claim jobs while slots are free and run them on `concurrency` threads
+    of this process (so a model loaded by one job is reused by all later ones).
+
+    once=True drains the queue and returns instead of polling forever.
+    stop: set it to stop claiming; running jobs are finished first.
+    Returns {"done": n, "failed": n}.
+    """
+    stop = stop or threading.Event()
+    concurrency = max(1, int(concurrency))
+    counts = {"done": 0, "failed": 0}
+
+    requeued = queue.recover()
+    logger.info(
+        "Worker start spool=%s concurrency=%d once=%s requeued=%d pid=%d",
+        queue.root, concurrency, once, requeued, os.getpid(),
+    )
+
+    running: dict = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job") as pool:
+        while not stop.is_set():
+            while len(running) < concurrency:
+                claimed = queue.claim()
+                if claimed is None:
+                    break
+                job_id, spec = claimed
+                running[pool.submit(_run_job, queue, handler, job_id, spec)] = job_id
+
+            if not running:
+                if once:
+                    break
+                stop.wait(poll)
+                continue
+
+            finished, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                running.pop(fut)
+                counts["done" if fut.result() else "failed"] += 1
+
+        if running:
+            logger.info("Worker stopping; waiting for %d running job(s)", len(running))
+        for fut in list(running):
+            counts["done" if fut.result() else "failed"] += 1
+
+    logger.info("Worker exit done=%d failed=%d", counts["done"], counts["failed"])
+    return counts
@@ -1,33 +1,135 @@
 import logging
 import os
+import threading
 from functools import lru_cache
-import whisper
+from typing import Callable, Iterator
+
+from utils.timing import stage
+from .chunked_transcription import faster_segment_dict, plan_audio_chunks, transcribe_chunked
+from .transcript_cache import load_segments, save_segments, transcript_key, transcript_options
 
 logger = logging.getLogger(__name__)
 
+BACKENDS = ("faster", "openai")
+
+# lru_cache does not stop two threads (e.g. concurrent worker jobs) loading the same model
+_MODEL_LOCK = threading.Lock()
+
+
+def _get_model(
+    model_size: str,
+    backend: str = "faster",
+    device: str = "auto",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+):
+    with _MODEL_LOCK:
+        return _load_model(model_size, backend, device, compute_type, cpu_threads, num_workers)
+
+
 @lru_cache(maxsize=4)
-def _get_model(model_size: str):
-    logger.info("Loading Whisper model size=%s", model_size)
-    return whisper.load_model(model_size)
+def _load_model(
+    model_size: str,
+    backend: str = "faster",
+    device: str = "auto",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+):
+    """
+    Load (once per option set) a Whisper model for the given backend:
+    - "faster": faster-whisper / CTranslate2 (int8 on CPU by default)
+    - "openai": openai-whisper on PyTorch
 
-def transcribe_audio_to_ass(
+    Backends are imported here, not at module load: torch alone takes seconds, and
+    transcript cache hits never need a model.
+    """
+    logger.info(
+        "Loading Whisper model backend=%s size=%s device=%s compute_type=%s cpu_threads=%s num_workers=%s",
+        backend, model_size, device, compute_type, cpu_threads, num_workers,
+    )
+    if backend == "faster":
+        with stage("model_load"):
+            from faster_whisper import WhisperModel
+            return WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+            )
+    if backend == "openai":
+        with stage("model_load"):
+            import whisper
+            return whisper.load_model(model_size)
+    raise ValueError(f"Unknown Whisper backend: {backend} (expected one of {BACKENDS})")
+
+
+def _iter_model_segments(
+    model,
+    backend: str,
+    audio_path: str,
+    task: str,
+    language: str | None,
+    workers: int = 1,
+    chunked: tuple | None = None,
+):
+    """
+    Start transcription with either backend and return (segment_iterator, detected_language).
+    Segments are openai-whisper style dicts: start, end, text (+ words when available).
+    faster-whisper decodes lazily, so segments arrive while the file is still being
+    transcribed; openai-whisper only returns after the full pass.
+
+    chunked: (samples, chunks) from plan_audio_chunks; the faster backend then
+    transcribes the chunks on `workers` threads (see transcribe_chunked).
+    """
+    if backend == "faster":
+        if chunked is not None:
+            audio, chunks = chunked
+            return transcribe_chunked(model, audio, chunks, task, language, workers)
+
+        seg_iter, info = model.transcribe(audio_path, task=task, language=language)
+        return (faster_segment_dict(seg) for seg in seg_iter), info.language
+
+    # You can pass language to reduce mis-detection if you know it
+    kwargs = {"task": task}
+    if language:
+        kwargs["language"] = language
+
+    result = model.transcribe(audio_path, **kwargs)
+    return iter(result.get("segments", [])), result.get("language")
+
+
+def iter_transcription(
     audio_path: str,
     ass_output: str,
     model_size: str = "base",
     translate: bool = False,
     language: str | None = None,
     max_line_chars: int | None = None,
-):
+    cache_dir: str | None = None,
+    backend: str = "faster",
+    device: str = "auto",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+    chunk_seconds: float = 600.0,
+    flush_every: int = 10,
+) -> Iterator[dict]:
     """
-    Transcribe or translate audio into ASS subtitle format.
+    Streaming form of transcribe_audio_to_ass: yields each segment dict as soon as the
+    backend produces it, after appending its Dialogue line to ass_output.
 
-    Args:
-        audio_path: path to input audio file
-        ass_output: path to output .ass subtitle file
-        model_size: whisper model size ("tiny", "base", "small", "medium", "large")
-        translate: if True, output subtitles in English
-        language: optionally force language (e.g., "hi", "en")
-        max_line_chars: optionally wrap long lines (very simple wrap)
+    The file is flushed every `flush_every` segments, so it can be read (e.g. by shorts
+    range selection) while a long file is still being transcribed. The finished file is
+    byte-identical to _to_ass(segments). The transcript cache is written only once the
+    iterator has been fully consumed.
+
+    With the faster backend and num_workers > 1, long audio is transcribed in parallel
+    chunks of at most chunk_seconds (0 disables chunking), cut at VAD silences; each
+    of the min(num_workers, chunks) replicas gets cpu_count / replicas threads unless
+    cpu_threads is set. Audio that fits one chunk gets one sequential pass on all cores.
     """
     if not os.path.isfile(audio_path):
         logger.error("Audio file not found: %s", audio_path)
@@ -35,27 +137,64 @@ def transcribe_audio_to_ass(
 
     os.makedirs(os.path.dirname(ass_output) or ".", exist_ok=True)
 
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown Whisper backend: {backend} (expected one of {BACKENDS})")
+
     task = "translate" if translate else "transcribe"
-    logger.info("Whisper start model=%s task=%s audio=%s", model_size, task, audio_path)
+    logger.info("Whisper start backend=%s model=%s task=%s audio=%s", backend, model_size, task, audio_path)
 
     try:
-        model = _get_model(model_size)
-
-        # You can pass language to reduce mis-detection if you know it
-        kwargs = {"task": task}
-        if language:
-            kwargs["language"] = language
-
-        result = model.transcribe(audio_path, **kwargs)
-
-        segments = result.get("segments", [])
-        logger.info("Whisper done segments=%d detected_lang=%s",
-                    len(segments), result.get("language"))
+        options = dict(device=device, compute_type=compute_type, num_workers=num_workers, chunk_seconds=chunk_seconds)
+        key = transcript_key(audio_path, model_size, task, language, backend, options) if cache_dir else None
+        cached = load_segments(cache_dir, key) if key else None
 
-        ass_text = _to_ass(segments, max_line_chars=max_line_chars)
+        if cached is not None:
+            source, detected_lang = iter(cached), None
+        else:
+            workers = int(num_workers)
+            chunked = None
+            if backend == "faster" and workers > 1 and chunk_seconds:
+                chunked = plan_audio_chunks(audio_path, workers, float(chunk_seconds))
+                if len(chunked[1]) <= 1:
+                    logger.info("Audio fits one chunk; transcribing in one sequential pass")
+                    chunked = None
+            # replicas only help when chunks run side by side
+            workers = min(workers, len(chunked[1])) if chunked else 1
+            if workers > 1 and not cpu_threads:
+                # split the cores between the model replicas instead of oversubscribing
+                cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+            model = _get_model(
+                model_size,
+                backend=backend,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=int(cpu_threads),
+                num_workers=workers,
+            )
+            source, detected_lang = _iter_model_segments(
+                model, backend, audio_path, task, language,
+                workers=workers, chunked=chunked,
+            )
 
+        segments = []
         with open(ass_output, "w", encoding="utf-8") as f:
-            f.write(ass_text)
+            f.write(_ASS_HEADER)
+            for seg in source:
+                f.write(_dialogue_line(seg, max_line_chars=max_line_chars) + "\n")
+                segments.append(seg)
+                if flush_every and len(segments) % flush_every == 0:
+                    f.flush()
+                yield seg
+
+        if cached is None:
+            logger.info("Whisper done segments=%d detected_lang=%s", len(segments), detected_lang)
+            if key:
+                save_segments(
+                    cache_dir, key, segments,
+                    meta={"audio": os.path.basename(audio_path), "backend": backend,
+                          "model": model_size, "task": task, "language": language or detected_lang,
+                          **transcript_options(backend, options)},
+                )
 
         logger.info("ASS subtitles saved: %s", ass_output)
 
@@ -64,8 +203,70 @@ def transcribe_audio_to_ass(
         raise
 
 
-def _to_ass(segments, max_line_chars: int | None = None) -> str:
-    header = """[Script Info]
+def transcribe_audio_to_ass(
+    audio_path: str,
+    ass_output: str,
+    model_size: str = "base",
+    translate: bool = False,
+    language: str | None = None,
+    max_line_chars: int | None = None,
+    cache_dir: str | None = None,
+    backend: str = "faster",
+    device: str = "auto",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+    chunk_seconds: float = 600.0,
+    on_segment: Callable[[dict], None] | None = None,
+    flush_every: int = 10,
+) -> list[dict]:
+    """
+    Transcribe or translate audio into ASS subtitle format.
+
+    Args:
+        audio_path: path to input audio file
+        ass_output: path to output .ass subtitle file
+        model_size: whisper model size ("tiny", "base", "small", "medium", "large")
+        translate: if True, output subtitles in English
+        language: optionally force language (e.g., "hi", "en")
+        max_line_chars: optionally wrap long lines (very simple wrap)
+        cache_dir: optional transcript cache; a hit (same audio content, model, task,
+            language and transcript_options) rebuilds the .ass from stored segments without loading Whisper
+        backend: "faster" (faster-whisper/CTranslate2, default) or "openai" (openai-whisper)
+        device / compute_type / cpu_threads / num_workers: faster-whisper model options
+            (e.g. compute_type="int8" for quantized CPU inference; cpu_threads=0 = library default)
+        chunk_seconds: with num_workers > 1, max chunk length for parallel transcription
+            (see iter_transcription; 0 = one sequential pass)
+        on_segment: optional callback invoked with each segment as it is written
+        flush_every: flush the .ass file every N segments (see iter_transcription)
+
+    Returns:
+        list of segment dicts (start, end, text, ...)
+    """
+    segments = []
+    for seg in iter_transcription(
+        audio_path,
+        ass_output,
+        model_size=model_size,
+        translate=translate,
+        language=language,
+        max_line_chars=max_line_chars,
+        cache_dir=cache_dir,
+        backend=backend,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+        chunk_seconds=chunk_seconds,
+        flush_every=flush_every,
+    ):
+        segments.append(seg)
+        if on_segment is not None:
+            on_segment(seg)
+    return segments
+
+
+_ASS_HEADER = """[Script Info]
 ScriptType: v4.00+
 Collisions: Normal
 PlayResX: 1920
@@ -79,20 +280,24 @@ Style: Default,Arial,48,&H00FFFFFF,&H00000000,0,0,0,0,100,100,0,0,1,3,0,2,10,10,
 [Events]
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
-    lines = []
-    for seg in segments:
-        start = _format_timestamp(float(seg["start"]))
-        end = _format_timestamp(float(seg["end"]))
 
-        text = (seg.get("text") or "").replace("\n", " ").strip()
-        text = _ass_escape(text)
 
-        if max_line_chars and len(text) > max_line_chars:
-            text = _wrap_simple(text, max_line_chars)
+def _dialogue_line(seg, max_line_chars: int | None = None) -> str:
+    start = _format_timestamp(float(seg["start"]))
+    end = _format_timestamp(float(seg["end"]))
 
-        lines.append(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}")
+    text = (seg.get("text") or "").replace("\n", " ").strip()
+    text = _ass_escape(text)
 
-    return header + "\n".join(lines) + ("\n" if lines else "")
+    if max_line_chars and len(text) > max_line_chars:
+        text = _wrap_simple(text, max_line_chars)
+
+    return f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}"
+
+
+def _to_ass(segments, max_line_chars: int | None = None) -> str:
+    lines = [_dialogue_line(seg, max_line_chars=max_line_chars) for seg in segments]
+    return _ASS_HEADER + "\n".join(lines) + ("\n" if lines else "")
 
 
 def _ass_escape(text: str) -> str:
@@ -0,0 +1,87 @@
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Interval(NamedTuple):
+    """
+    A span of the slideshow during which the rendered picture does not change.
+    """
+    start: float
+    end: float
+    image: int  # index into the slideshow's image list
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _parse_ass_time(value: str) -> float:
+    h, m, s = value.strip().split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def ass_event_times(ass_path: str) -> List[float]:
+    """
+    Every Dialogue start/end time in an .ass file (the moments the burned text changes).
+    """
+    times = set()
+    with open(ass_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("Dialogue:"):
+                continue
+            fields = line[len("Dialogue:"):].split(",", 9)
+            try:
+                times.add(_parse_ass_time(fields[1]))
+                times.add(_parse_ass_time(fields[2]))
+            except (IndexError, ValueError):
+                logger.debug("Unparseable Dialogue line: %s", line.rstrip())
+    return sorted(times)
+
+
+def segment_event_times(segments: Iterable[dict]) -> List[float]:
+    """
+    Same as ass_event_times, from Whisper segment dicts instead of the .ass file.
+    """
+    times = set()
+    for seg in segments:
+        times.add(float(seg["start"]))
+        times.add(float(seg["end"]))
+    return sorted(times)
+
+
+def build_timeline(image_durations: List[float], change_points: Iterable[float]) -> List[Interval]:
+    """
+    Merge image cut times with other visual change points (subtitle events, forced
+    keyframes) into sorted, non-overlapping "visual change" intervals.
+
+    Each image's span [t, t + duration) is split at every change point strictly
+    inside it; the result covers the slideshow end to end with no gaps. Points are
+    sorted once and each span finds its slice by bisection.
+    """
+    points = sorted(set(float(c) for c in change_points))
+    intervals: List[Interval] = []
+    t = 0.0
+    for idx, dur in enumerate(image_durations):
+        end = t + float(dur)
+        inside = points[bisect_right(points, t):bisect_left(points, end)]
+        bounds = [t] + inside + [end]
+        for a, b in zip(bounds, bounds[1:]):
+            if b > a:
+                intervals.append(Interval(a, b, idx))
+        t = end
+    return intervals
+
+
+def log_frame_savings(intervals: List[Interval], duration: float, fps: float) -> None:
+    """
+    Log how many unique frames the run needs versus constant-fps rendering.
+    """
+    cfr_frames = int(duration * fps)
+    unique = len(intervals)
+    logger.info(
+        "Timeline unique_frames=%d cfr_frames=%d (duration=%.2fs * fps=%s) ratio=%.1fx",
+        unique, cfr_frames, duration, fps, (cfr_frames / unique) if unique else 0.0,
+    )
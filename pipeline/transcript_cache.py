@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+
+from utils.hashing import file_sha256, text_sha256
+from utils.jsonio import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored segment format changes
+_FORMAT_VERSION = 1
+
+
+def transcript_options(backend: str = "faster", options: dict | None = None) -> dict:
+    """
+    The Whisper options (see config.WHISPER_OPTIONS) that change the transcript, normalized.
+
+    device and compute_type always count (int8 and float32 decode differently). The
+    faster backend with num_workers > 1 and chunk_seconds > 0 transcribes VAD-split
+    chunks and merges them, so segments break at chunk boundaries that depend on both
+    values; in every other mode they, like cpu_threads, only change speed.
+    """
+    options = options or {}
+    workers = int(options.get("num_workers") or 1)
+    chunk_seconds = float(options.get("chunk_seconds") or 0)
+    chunked = backend == "faster" and workers > 1 and chunk_seconds > 0
+    return {
+        "device": options.get("device") or "auto",
+        "compute_type": options.get("compute_type") or "int8",
+        "chunking": [workers, chunk_seconds] if chunked else None,
+    }
+
+
+def transcript_key(
+    audio_path: str,
+    model_size: str,
+    task: str,
+    language: str | None = None,
+    backend: str = "faster",
+    options: dict | None = None,
+) -> str:
+    """
+    Cache key: audio content hash + everything that changes Whisper's output,
+    including the output-relevant model options (see transcript_options).
+    """
+    return text_sha256(
+        f"v{_FORMAT_VERSION}", file_sha256(audio_path), backend, model_size, task, language or "auto",
+        json.dumps(transcript_options(backend, options), sort_keys=True),
+    )
+
+
+def _normalize_segments(segments) -> list[dict]:
+    """
+    Reduce Whisper segments to plain JSON-safe dicts: start, end, text (+ words if present).
+    """
+    out = []
+    for seg in segments:
+        item = {
+            "start": float(seg["start"]),
+            "end": float(seg["end"]),
+            "text": seg.get("text") or "",
+        }
+        words = seg.get("words")
+        if words:
+            item["words"] = [
+                {
+                    "start": float(w["start"]),
+                    "end": float(w["end"]),
+                    "word": w.get("word") or "",
+                }
+                for w in words
+            ]
+        out.append(item)
+    return out
+
+
+def has_segments(cache_dir: str, key: str) -> bool:
+    """
+    True if an entry for key exists (without reading it).
+    """
+    return os.path.isfile(os.path.join(cache_dir, f"{key}.json"))
+
+
+def load_segments(cache_dir: str, key: str) -> list[dict] | None:
+    """
+    Return cached segments for key, or None on miss/corrupt entry.
+    """
+    path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Transcript cache entry unreadable, ignoring: %s", path, exc_info=True)
+        return None
+
+    segments = data.get("segments")
+    if not isinstance(segments, list):
+        return None
+
+    logger.info("Transcript cache hit key=%s segments=%d", key[:12], len(segments))
+    return segments
+
+
+def save_segments(cache_dir: str, key: str, segments, meta: dict | None = None) -> list[dict]:
+    """
+    Persist segments under key (atomic write). Returns the normalized segment list.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    normalized = _normalize_segments(segments)
+    path = os.path.join(cache_dir, f"{key}.json")
+
+    try:
+        write_json_atomic(path, {"meta": meta or {}, "segments": normalized}, indent=None)
+        logger.info("Transcript cached key=%s segments=%d", key[:12], len(normalized))
+    except Exception:
+        logger.warning("Transcript cache write failed: %s", path, exc_info=True)
+
+    return normalized
@@ -1,15 +1,27 @@
 import logging
 import os
+import shutil
+import tempfile
 import uuid
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 from tqdm import tqdm
-from moviepy import ImageClip, AudioFileClip, CompositeVideoClip, concatenate_videoclips
 
-from .image_utils import resize_image
+from .encoders import encoder_args, encoder_params, encoder_threads, resolve_encoder
+from .ffmpeg_utils import probe_duration, run_ffmpeg, write_concat_list
+from .frame_cache import FrameCache
+from .image_utils import SlideshowFrames, image_readable, resize_images
+from .shorts_creator import planned_cut_times
+from .timeline import ass_event_times, build_timeline, log_frame_savings
 from .subtitle_utils import transcribe_audio_to_ass
+from utils.timing import propagate, stage
 
 logger = logging.getLogger(__name__)
 
+# encoder timebase of VFR slideshows (1 ms keeps change points exact)
+_VFR_TICK = 0.001
+
 
 def _ffmpeg_ass_filter(ass_path: str) -> str:
     """
@@ -33,7 +45,31 @@ def _ffmpeg_ass_filter(ass_path: str) -> str:
     return f"ass='{p}'"
 
 
-def burn_subtitles(video_path: str, ass_path: str, output_path_with_subs: str, strict: bool = True) -> str:
+def _force_keyframe_args(times: list[float] | None) -> list[str]:
+    """
+    x264 args forcing IDR frames at the given timestamps (e.g. planned shorts cuts).
+    """
+    if not times:
+        return []
+    stamps = sorted({round(float(t), 3) for t in times if float(t) > 0})
+    if not stamps:
+        return []
+    return ["-force_key_frames", ",".join(f"{t:.3f}" for t in stamps)]
+
+
+def burn_subtitles(
+    video_path: str,
+    ass_path: str,
+    output_path_with_subs: str,
+    strict: bool = True,
+    extra_args: list[str] | None = None,
+    encoder: dict | None = None,
+) -> str:
+    """
+    Re-encode video_path with the .ass subtitles burned in (audio stream-copied).
+    encoder: resolved encoder settings (see encoders.resolve_encoder); None keeps
+    ffmpeg's defaults.
+    """
     logger.info("Burning subtitles video=%s ass=%s out=%s", video_path, ass_path, output_path_with_subs)
 
     if not os.path.isfile(video_path):
@@ -48,7 +84,9 @@ def burn_subtitles(video_path: str, ass_path: str, output_path_with_subs: str, s
         "ffmpeg", "-y",
         "-i", video_path,
         "-vf", vf,
+        *(encoder_args(encoder, threads=os.cpu_count() or 4) if encoder else []),
         "-c:a", "copy",
+        *(extra_args or []),
         output_path_with_subs,
     ]
 
@@ -72,6 +110,121 @@ def burn_subtitles(video_path: str, ass_path: str, output_path_with_subs: str, s
     return output_path_with_subs
 
 
+def _iter_resized(
+    image_paths: list[str],
+    workers: int | None = None,
+    cache: FrameCache | None = None,
+    size: tuple[int, int] = (1920, 1080),
+):
+    """
+    Yield resized RGB arrays for the valid images (in order), logging and skipping the rest.
+    Decoding/resizing runs on a process pool; see resize_images.
+    """
+    results = resize_images(image_paths, target_size=size, workers=workers, cache=cache)
+    for img_path, img_array in tqdm(results, total=len(image_paths), desc="🖼️ Processing Images"):
+        if img_array is None:
+            logger.warning("Skipping invalid image: %s", img_path)
+            continue
+        yield img_array
+
+    if cache is not None:
+        cache.log_stats()
+        cache.flush()
+
+
+def _warm_frame_cache(
+    image_paths: list[str],
+    size: tuple[int, int],
+    workers: int | None,
+    cache: FrameCache,
+    until,
+) -> int:
+    """
+    Resize images into the frame cache on the process pool until the `until` future
+    is done (transcription finished) or half the cache is filled, so the lazy moviepy
+    slideshow then reads them as cache hits. Returns the number of frames warmed.
+    """
+    budget = cache.max_bytes // 2
+    frame_bytes = size[0] * size[1] * 3
+    warmed = 0
+    results = resize_images(image_paths, target_size=size, workers=workers, cache=cache)
+    try:
+        for _, img in results:
+            if img is not None:
+                warmed += 1
+            if until.done() or (warmed + 1) * frame_bytes > budget:
+                break
+    finally:
+        # shuts the pool down after the images already being resized
+        results.close()
+    cache.flush()
+    logger.info("Frame cache warmed %d/%d images while transcribing", warmed, len(image_paths))
+    return warmed
+
+
+def _encode_ffmpeg_slideshow(
+    audio_path: str,
+    stills: list[tuple[str, float]],
+    output_path: str,
+    work_dir: str,
+    fps: int = 24,
+    preset: str = "medium",
+    vf: str | None = None,
+    extra_args: list[str] | None = None,
+    vfr: bool = False,
+    encoder: dict | None = None,
+) -> str:
+    """
+    Encode (still_path, duration) pairs + audio with ffmpeg's concat demuxer.
+    Output matches the MoviePy engine: constant fps, yuv420p video, AAC audio.
+    encoder: resolved encoder settings; None = libx264 with `preset`.
+
+    Each concat entry enters the filter graph as exactly one frame, so `vf` (libass)
+    rasterizes once per entry; the trailing fps filter then repeats frames up to the
+    constant output rate. vfr=True drops that fps filter: the encoder only sees frames
+    where the picture changes, each with its own timestamp/duration.
+    """
+    if vfr and stills and stills[-1][1] > _VFR_TICK:
+        # a frame's duration is the gap to the next one, and the closing entry (the last
+        # still repeated, see write_concat_list) would land exactly on the audio end and
+        # be cut by -shortest, leaving the last picture one tick long. End the last entry
+        # one tick early so the closing frame holds it to the audio end.
+        stills = [*stills[:-1], (stills[-1][0], stills[-1][1] - _VFR_TICK)]
+
+    # image timestamps would otherwise be quantized to the image demuxer's 1/25s default
+    list_path = write_concat_list(
+        stills,
+        os.path.join(work_dir, "stills.ffconcat"),
+        file_options={"framerate": 1000},
+    )
+
+    filters = ["format=yuv420p"]
+    if vf:
+        filters.append(vf)
+    if not vfr:
+        filters.append(f"fps={fps}")
+    else:
+        extra_args = ["-vsync", "vfr", "-enc_time_base", f"1:{round(1 / _VFR_TICK)}", *(extra_args or [])]
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "concat", "-safe", "0", "-i", list_path,
+        "-i", audio_path,
+        "-map", "0:v:0", "-map", "1:a:0",
+        "-vf", ",".join(filters),
+        *encoder_args(encoder or resolve_encoder(None, preset), threads=os.cpu_count() or 4),
+        "-c:a", "aac",
+        "-shortest",
+        *(extra_args or []),
+        output_path,
+    ]
+    run_ffmpeg(cmd, what="slideshow encode")
+
+    if not os.path.exists(output_path):
+        raise RuntimeError(f"FFmpeg slideshow encode produced no output: {output_path}")
+    return output_path
+
+
 def generate_video(
     audio_path: str,
     image_paths: list[str],
@@ -81,20 +234,82 @@ def generate_video(
     fps: int = 24,
     preset: str = "medium",
     translate_subs: bool = True,
+    keep_intermediate: bool = False,
+    engine: str = "moviepy",
+    workers: int | None = None,
+    frame_cache: FrameCache | None = None,
+    transcript_cache_dir: str | None = None,
+    whisper_backend: str = "faster",
+    whisper_options: dict | None = None,
+    overlap: bool = True,
+    keyframe_times: list[float] | None = None,
+    shorts_plan: dict | None = None,
+    vfr: bool = False,
+    encoders: dict | None = None,
+    size: tuple[int, int] = (1920, 1080),
+    prefetch: int = 2,
 ) -> str:
     """
     Generate a video with audio + image slideshow, add subtitles (transcribe/translate),
     then burn subtitles with ffmpeg.
+
+    By default the ASS file is applied as an ffmpeg filter during the slideshow
+    encode itself (single pass), so the subtitle-less output_path is never written.
+    keep_intermediate=True restores the old two-pass flow (write output_path,
+    then re-encode it with burn_subtitles), which is handy for debugging.
+
+    engine:
+        "moviepy" -> frames produced in Python by a lazy image source (original path)
+        "ffmpeg"  -> resized stills written once as PNG and fed to ffmpeg's concat
+                     demuxer, so frames never pass through Python
+
+    workers: processes used for image decode/resize (None = all cores, 1 = serial);
+        with the moviepy engine, the number of decode threads instead.
+    frame_cache: optional FrameCache of resized frames shared across runs.
+    transcript_cache_dir: optional Whisper segment cache (see transcript_cache).
+    whisper_backend / whisper_options: transcription backend ("faster" or "openai") and
+        extra model options (device, compute_type, cpu_threads, num_workers, chunk_seconds).
+    overlap: run transcription on a background thread, joining only when the subtitles
+        are needed. The single-pass encode burns them in, so only the work before it
+        overlaps: decoding/resizing/writing the stills with the ffmpeg engine; with the
+        moviepy engine (whose images are decoded lazily during the encode) the wait
+        resizes images into frame_cache on the process pool instead ("warm_frames"
+        stage), so the encode reads them as cache hits. Without a frame cache nothing
+        overlaps there. With keep_intermediate the whole base encode overlaps as well.
+        Each stage logs its start/end timestamps, so the real overlap shows in the log.
+    keyframe_times / shorts_plan: timestamps to encode as forced keyframes, given directly
+        or derived from the shorts config (short_len, count, gap; see planned_cut_times),
+        so create_shorts can seek/cut exactly on IDR frames.
+    vfr: ffmpeg engine only. Encode one frame per visual change (image boundary,
+        subtitle start/end, forced keyframe) with real timestamps instead of `fps`
+        identical frames per second, so encode time scales with the number of changes
+        rather than the audio length.
+    encoders: render-profile stages (see config.RENDER_PROFILES); "base" drives the
+        slideshow encode and "burn" the keep_intermediate subtitle pass. Missing
+        stages fall back to libx264 with `preset`.
+    size: output (width, height); images are letterboxed to it. Subtitles scale with
+        the frame (the .ass script is authored at 1920x1080).
+    prefetch: moviepy engine only. Images are decoded/resized lazily as the encoder
+        reaches them, this many ahead of the playhead (at least workers - 1, see
+        SlideshowFrames), so memory stays flat however many images there are.
     """
     audio = None
+    subs_pool = None
+    subs_future = None
     video = None
-    clips: list[ImageClip] = []
+    frames = None
+    stills_dir = None
 
     try:
         if not os.path.isfile(audio_path):
             raise FileNotFoundError(f"Audio not found: {audio_path}")
         if not image_paths:
             raise ValueError("image_paths is empty")
+        if engine not in ("moviepy", "ffmpeg"):
+            raise ValueError(f"Unknown engine: {engine} (expected 'moviepy' or 'ffmpeg')")
+        if vfr and engine != "ffmpeg":
+            logger.warning("vfr requires engine='ffmpeg'; encoding constant %s fps with %s", fps, engine)
+            vfr = False
 
         os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
         os.makedirs(subtitle_dir, exist_ok=True)
@@ -102,62 +317,156 @@ def generate_video(
         # unique subtitle file
         ass_output = os.path.join(subtitle_dir, f"subs_{uuid.uuid4().hex}.ass")
 
+        if engine == "ffmpeg":
+            binary = "ffmpeg"
+        else:
+            # imported here so the ffmpeg engine never pays for importing MoviePy;
+            # MoviePy drives its own (imageio) ffmpeg binary, whose encoder set may differ
+            from moviepy import AudioFileClip, VideoClip
+            from moviepy.config import FFMPEG_BINARY as binary
+        base_encoder = resolve_encoder((encoders or {}).get("base"), preset, binary=binary)
+
         logger.info(
-            "generate_video start audio=%s images=%d out=%s fps=%d preset=%s model=%s translate=%s",
-            audio_path, len(image_paths), output_path, fps, preset, model_size, translate_subs
+            "generate_video start audio=%s images=%d out=%s size=%dx%d fps=%d codec=%s preset=%s crf=%s "
+            "model=%s translate=%s keep_intermediate=%s engine=%s overlap=%s",
+            audio_path, len(image_paths), output_path, size[0], size[1], fps,
+            base_encoder["codec"], base_encoder["preset"], base_encoder.get("crf"),
+            model_size, translate_subs, keep_intermediate, engine, overlap,
         )
 
         # Generate subtitles
-        transcribe_audio_to_ass(
-            audio_path=audio_path,
-            ass_output=ass_output,
-            model_size=model_size,
-            translate=translate_subs
-        )
-        logger.info("ASS generated: %s", ass_output)
+        def _transcribe() -> str:
+            with stage("transcribe"):
+                transcribe_audio_to_ass(
+                    audio_path=audio_path,
+                    ass_output=ass_output,
+                    model_size=model_size,
+                    translate=translate_subs,
+                    cache_dir=transcript_cache_dir,
+                    backend=whisper_backend,
+                    **(whisper_options or {}),
+                )
+            logger.info("ASS generated: %s", ass_output)
+            return ass_output
+
+        def _wait_subtitles() -> None:
+            if subs_future is not None:
+                with stage("wait_transcribe"):
+                    subs_future.result()
+
+        if overlap:
+            subs_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcribe")
+            subs_future = subs_pool.submit(propagate(_transcribe))
+        else:
+            _transcribe()
 
         # prepare audio & images
-        audio = AudioFileClip(audio_path)
-        duration = float(audio.duration or 0.0)
+        with stage("load_audio"):
+            if engine == "ffmpeg":
+                duration = probe_duration(audio_path)
+            else:
+                audio = AudioFileClip(audio_path)
+                duration = float(audio.duration or 0.0)
         if duration <= 0:
             raise ValueError(f"Invalid audio duration: {duration}")
 
         image_duration = duration / len(image_paths)
         logger.info("Audio duration=%.2fs -> per-image duration=%.3fs", duration, image_duration)
 
-        # Build image clips
-        for img_path in tqdm(image_paths, desc="🖼️ Processing Images"):
-            try:
-                img_array = resize_image(img_path)
-                if img_array is None:
-                    logger.warning("Skipping invalid image: %s", img_path)
-                    continue
-                clips.append(ImageClip(img_array, duration=image_duration))
-            except Exception:
-                logger.exception("Failed processing image: %s", img_path)
-
-        if not clips:
-            raise ValueError("No valid images to create video.")
-
-        logger.info("Creating slideshow clips=%d", len(clips))
-
-        video = concatenate_videoclips(clips, method="compose")
-        video = CompositeVideoClip([video])
-        video.audio = audio
-
-        logger.info("Writing base video: %s", output_path)
-        video.write_videofile(
-            output_path,
-            codec="libx264",
-            audio_codec="aac",
-            fps=fps,
-            preset=preset,
-            threads=os.cpu_count() or 4,
-            logger=None,  # prevents MoviePy console spam; your logs stay clean
-        )
+        cut_times = list(keyframe_times or [])
+        if shorts_plan:
+            cut_times += planned_cut_times(duration, **shorts_plan)
+        key_args = _force_keyframe_args(cut_times)
+        if key_args:
+            logger.info("Forcing keyframes at %d planned cut points", len(key_args[1].split(",")))
 
         output_with_subs = os.path.splitext(output_path)[0] + "_subtitled.mp4"
-        final_path = burn_subtitles(output_path, ass_output, output_with_subs, strict=True)
+
+        # Single pass: libass runs inside the same ffmpeg process that encodes the slideshow.
+        # keep_intermediate: encode output_path without subtitles and burn them afterwards.
+        encode_path = output_path if keep_intermediate else output_with_subs
+        vf = None if keep_intermediate else _ffmpeg_ass_filter(ass_output)
+
+        if engine == "ffmpeg":
+            stills_dir = tempfile.mkdtemp(prefix="stills_", dir=os.path.dirname(output_path) or ".")
+            stills: list[tuple[str, float]] = []
+            with stage("images"):
+                for img_array in _iter_resized(image_paths, workers=workers, cache=frame_cache, size=size):
+                    still_path = os.path.join(stills_dir, f"{len(stills):05d}.png")
+                    Image.fromarray(img_array).save(still_path, compress_level=1)
+                    stills.append((still_path, image_duration))
+
+            if not stills:
+                raise ValueError("No valid images to create video.")
+
+            # One frame per visual change: image boundaries, forced keyframes and (when
+            # subtitles are rendered from this frame sequence) every Dialogue start/end.
+            change_points = list(cut_times)
+            if vf or vfr:
+                _wait_subtitles()
+                change_points += ass_event_times(ass_output)
+
+            with stage("assemble"):
+                intervals = build_timeline([d for _, d in stills], change_points)
+                log_frame_savings(intervals, duration, fps)
+                entries = [(stills[iv.image][0], iv.duration) for iv in intervals]
+
+            logger.info("Writing video with ffmpeg engine stills=%d frames=%d: %s",
+                        len(stills), len(entries), encode_path)
+            with stage("encode"):
+                _encode_ffmpeg_slideshow(
+                    audio_path, entries, encode_path, stills_dir, fps=fps, preset=preset, vf=vf,
+                    extra_args=key_args, vfr=vfr, encoder=base_encoder,
+                )
+        else:
+            # header check only; pixels are decoded during the encode (see SlideshowFrames)
+            with stage("images"):
+                valid = [p for p in image_paths if image_readable(p)]
+            if not valid:
+                raise ValueError("No valid images to create video.")
+
+            # before the slideshow exists: its prefetch threads share frame_cache
+            if vf and subs_future is not None and frame_cache is not None and not subs_future.done():
+                with stage("warm_frames"):
+                    _warm_frame_cache(valid, size, workers, frame_cache, until=subs_future)
+
+            logger.info("Creating lazy slideshow images=%d", len(valid))
+
+            with stage("assemble"):
+                frames = SlideshowFrames(
+                    valid, image_duration, size=size, prefetch=prefetch, workers=workers, cache=frame_cache,
+                )
+                video = VideoClip(frames, duration=frames.duration)
+                video.audio = audio
+
+            if vf:
+                _wait_subtitles()
+
+            logger.info("Writing video with moviepy engine: %s", encode_path)
+            with stage("encode"):
+                video.write_videofile(
+                    encode_path,
+                    codec=base_encoder["codec"],
+                    audio_codec="aac",
+                    fps=fps,
+                    preset=base_encoder["preset"],
+                    threads=encoder_threads(base_encoder, os.cpu_count() or 4),
+                    ffmpeg_params=(["-vf", vf] if vf else []) + encoder_params(base_encoder) + key_args or None,
+                    logger=None,  # prevents MoviePy console spam; your logs stay clean
+                )
+
+        if keep_intermediate:
+            _wait_subtitles()
+            with stage("burn"):
+                final_path = burn_subtitles(
+                    output_path, ass_output, output_with_subs, strict=True,
+                    extra_args=(["-vsync", "vfr"] if vfr else []) + key_args,
+                    encoder=resolve_encoder((encoders or {}).get("burn"), preset),
+                )
+        else:
+            if not os.path.exists(output_with_subs):
+                raise RuntimeError(f"Single-pass render produced no output: {output_with_subs}")
+            final_path = output_with_subs
 
         logger.info("generate_video done final=%s", final_path)
         return final_path
@@ -168,6 +477,10 @@ def generate_video(
 
     finally:
         # Cleanup
+        if subs_pool is not None:
+            # on failure elsewhere, don't block on a still-running transcription
+            subs_pool.shutdown(wait=False, cancel_futures=True)
+
         try:
             if audio:
                 audio.close()
@@ -180,8 +493,9 @@ def generate_video(
         except Exception:
             logger.debug("Video close failed", exc_info=True)
 
-        for c in clips:
-            try:
-                c.close()
-            except Exception:
-                pass
+        if frames is not None:
+            frames.close()
+
+        # stills are kept alongside the intermediate video when debugging
+        if stills_dir and not keep_intermediate:
+            shutil.rmtree(stills_dir, ignore_errors=True)
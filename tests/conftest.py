@@ -0,0 +1,29 @@
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+from benchmarks.fixtures import make_images, make_wav
+
+requires_ffmpeg = pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")), reason="ffmpeg/ffprobe not on PATH",
+)
+
+
+@pytest.fixture
+def audio_12s(tmp_path) -> str:
+    return make_wav(str(tmp_path / "audio.wav"), 12.0)
+
+
+@pytest.fixture
+def small_stills(tmp_path) -> list[str]:
+    """
+    Three 320x180 PNG stills (fast to encode).
+    """
+    paths = []
+    for i, src in enumerate(make_images(str(tmp_path / "src"), 3)):
+        path = os.path.join(tmp_path, f"still_{i}.png")
+        Image.open(src).convert("RGB").resize((320, 180)).save(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,72 @@
+from pipeline.batch import BatchJob, JobResult, discover_jobs, episode_images, log_throughput
+
+
+def _touch(path, data: bytes = b"x") -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_episode_images_prefers_folder_then_images_subfolder(tmp_path):
+    ep = tmp_path / "ep"
+    _touch(ep / "images" / "001.png")
+    assert episode_images(str(ep)) == [str(ep / "images" / "001.png")]
+
+    b = _touch(ep / "b.JPG")
+    a = _touch(ep / "a.jpeg")
+    _touch(ep / "notes.txt")
+    assert episode_images(str(ep)) == [a, b]
+
+
+def test_discover_jobs_pairs_audio_files_with_sibling_or_default_images(tmp_path):
+    ep01 = _touch(tmp_path / "ep01.m4a")
+    ep01_img = _touch(tmp_path / "ep01" / "1.png")
+    ep02 = _touch(tmp_path / "ep02.mp4")
+    shared = _touch(tmp_path / "shared" / "s.jpg")
+
+    jobs = discover_jobs([ep01, ep02, str(tmp_path / "notes.txt"), str(tmp_path / "missing.m4a")],
+                         default_images=str(tmp_path / "shared"))
+    assert jobs == [BatchJob("ep01", ep01, [ep01_img]), BatchJob("ep02", ep02, [shared])]
+
+
+def test_discover_jobs_expands_folders_and_skips_episodes_without_audio_or_images(tmp_path):
+    season = tmp_path / "season"
+    b_audio = _touch(season / "b" / "b.m4a")
+    b_img = _touch(season / "b" / "images" / "1.png")
+    a_audio = _touch(season / "a" / "z.mp4")
+    _touch(season / "a" / "y.m4a")  # second audio file: first by name wins
+    a_img = _touch(season / "a" / "1.png")
+    _touch(season / "no_audio" / "1.png")
+    _touch(season / "no_images" / "c.m4a")
+    _touch(season / "loose.png")
+
+    jobs = discover_jobs([str(season)])
+    assert jobs == [
+        BatchJob("a", str(season / "a" / "y.m4a"), [a_img]),
+        BatchJob("b", b_audio, [b_img]),
+    ]
+    assert a_audio not in [j.audio for j in jobs]
+
+    # an episode folder given directly is one job, not a scan of its subfolders
+    assert discover_jobs([str(season / "b")]) == [BatchJob("b", b_audio, [b_img])]
+    assert discover_jobs([str(season / "no_audio")]) == []
+
+
+def test_discover_jobs_suffixes_duplicate_names(tmp_path):
+    one = _touch(tmp_path / "one" / "ep" / "ep.m4a")
+    _touch(tmp_path / "one" / "ep" / "1.png")
+    two = _touch(tmp_path / "two" / "ep" / "ep.m4a")
+    _touch(tmp_path / "two" / "ep" / "1.png")
+
+    jobs = discover_jobs([str(tmp_path / "one"), str(tmp_path / "two"), str(tmp_path / "one" / "ep")])
+    assert [(j.name, j.audio) for j in jobs] == [("ep", one), ("ep_2", two), ("ep_3", one)]
+
+
+def test_log_throughput_counts_only_successful_audio():
+    summary = log_throughput(
+        [JobResult("a", True, 120.0, 30.0, 2), JobResult("b", False, 60.0, 5.0, 0, "boom")],
+        wall_seconds=40.0,
+    )
+    assert summary["ok"] == 1 and summary["failed"] == 1
+    assert summary["speed"] == 3.0
+    assert summary["jobs_per_hour"] == 90.0
@@ -0,0 +1,32 @@
+from pipeline.chunked_transcription import Chunk, _offset, merge_segments, plan_chunks
+
+
+def test_plan_chunks_cuts_in_the_middle_of_long_enough_silences():
+    speech = [(0.0, 20.0), (20.2, 35.0), (36.0, 70.0), (71.0, 90.0)]
+
+    chunks = plan_chunks(speech, duration=100.0, target=30.0)
+
+    # 20.0-20.2 is shorter than MIN_SILENCE_S; the first cut waits for 35.0-36.0
+    assert chunks == [Chunk(0, 0.0, 35.5), Chunk(1, 35.5, 70.5), Chunk(2, 70.5, 100.0)]
+
+
+def test_plan_chunks_keeps_long_speech_in_one_chunk():
+    assert plan_chunks([(0.0, 80.0)], duration=90.0, target=30.0) == [Chunk(0, 0.0, 90.0)]
+    assert plan_chunks([], duration=90.0, target=30.0) == [Chunk(0, 0.0, 90.0)]
+
+
+def test_offset_shifts_to_file_time_and_clamps_to_the_chunk():
+    seg = {"start": 1.0, "end": 12.0, "text": " hi", "words": [{"start": 1.0, "end": 11.5, "word": " hi"}]}
+
+    out = _offset(seg, Chunk(1, 30.0, 40.0))
+
+    assert (out["start"], out["end"]) == (31.0, 40.0)
+    assert out["words"] == [{"start": 31.0, "end": 40.0, "word": " hi"}]
+
+
+def test_merge_segments_keeps_every_segment_in_order():
+    first = [{"start": 0.0, "end": 1.0, "text": "yes yes"}, {"start": 1.0, "end": 1.4, "text": "yes"}]
+    second = [{"start": 30.0, "end": 31.0, "text": "yes"}]
+
+    assert list(merge_segments([first, second])) == first + second
+    assert list(merge_segments([[], second])) == second
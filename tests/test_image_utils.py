@@ -0,0 +1,60 @@
+import numpy as np
+
+from pipeline import frame_cache, image_utils
+from pipeline.frame_cache import FrameCache
+from pipeline.image_utils import SlideshowFrames, resize_images
+
+
+def test_resize_images_never_hashes_in_parent(tmp_path, small_stills, monkeypatch):
+    hashed = []
+
+    def _counting_sha256(path):
+        hashed.append(path)
+        raise AssertionError(f"hashed in the parent process: {path}")
+
+    monkeypatch.setattr(frame_cache, "file_sha256", _counting_sha256)
+    monkeypatch.setattr(image_utils, "file_sha256", _counting_sha256)
+    cache_dir = str(tmp_path / "frames")
+
+    def _run() -> tuple[list, FrameCache]:
+        cache = FrameCache(cache_dir)
+        frames = [img for _, img in resize_images(small_stills, (64, 36), workers=2, cache=cache)]
+        cache.flush()
+        return frames, cache
+
+    first, cache = _run()
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    # new process state: digests come from the saved index, frames from the cache
+    second, cache = _run()
+    assert (cache.hits, cache.misses) == (3, 0)
+    assert hashed == []
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_frame_cache_evicts_least_recently_used(tmp_path):
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    cache = FrameCache(str(tmp_path / "frames"))
+    cache.put("aa", frame)
+    entry_size = cache._total
+    cache.max_bytes = 3 * entry_size
+
+    cache.put("bb", frame)
+    cache.put("cc", frame)
+    assert cache.get("aa") is not None  # now most recently used
+    cache.put("dd", frame)
+
+    assert cache.evictions == 1
+    assert cache.get("bb") is None
+    assert all(cache.get(k) is not None for k in ("aa", "cc", "dd"))
+    assert cache._total == 3 * entry_size
+
+
+def test_slideshow_frames_window_covers_every_decode_thread(small_stills):
+    frames = SlideshowFrames(small_stills, 1.0, size=(64, 36), prefetch=0, workers=3)
+    frames(0.0)
+    assert frames.prefetch == 2
+    assert frames._pool._max_workers == 3
+    assert sorted(frames._pending) == [1, 2]
+    frames.close()
@@ -0,0 +1,71 @@
+from main import _video_stage_inputs
+from pipeline.runner import IncompleteStage, run_stage
+from pipeline.transcript_cache import transcript_key
+from utils.manifest import BuildManifest
+
+
+def _stage_runs(tmp_path, whisper_options: dict, runs: list) -> None:
+    audio = tmp_path / "audio.wav"
+    image = tmp_path / "001.png"
+    output = tmp_path / "output.mp4"
+    audio.write_bytes(b"audio")
+    image.write_bytes(b"image")
+
+    def _stage() -> list[str]:
+        runs.append(dict(whisper_options))
+        output.write_bytes(b"video")
+        return [str(output)]
+
+    inputs = _video_stage_inputs(str(audio), [str(image)], str(output), {"fps": 24}, whisper_options)
+    run_stage(BuildManifest(str(tmp_path / "manifest.json")), "video", inputs, _stage)
+
+
+def test_video_stage_tracks_transcript_changing_whisper_options(tmp_path):
+    options = {"device": "cpu", "compute_type": "int8", "cpu_threads": 0, "num_workers": 1, "chunk_seconds": 600.0}
+    runs: list = []
+
+    # threads, and chunk length without parallel chunking, only change speed
+    _stage_runs(tmp_path, options, runs)
+    _stage_runs(tmp_path, dict(options, cpu_threads=2, chunk_seconds=120.0), runs)
+    assert len(runs) == 1
+
+    _stage_runs(tmp_path, dict(options, compute_type="float32"), runs)
+    assert len(runs) == 2
+
+    # parallel chunking cuts and merges segments at chunk boundaries
+    _stage_runs(tmp_path, dict(options, compute_type="float32", num_workers=4), runs)
+    assert len(runs) == 3
+    _stage_runs(tmp_path, dict(options, compute_type="float32", num_workers=4, chunk_seconds=120.0), runs)
+    assert len(runs) == 4
+
+
+def test_transcript_key_matches_stage_options(tmp_path):
+    audio = tmp_path / "audio.wav"
+    audio.write_bytes(b"audio")
+    base = {"device": "auto", "compute_type": "int8", "num_workers": 1, "chunk_seconds": 600.0}
+
+    def _key(**changes) -> str:
+        return transcript_key(str(audio), "base", "transcribe", options=dict(base, **changes))
+
+    assert _key(cpu_threads=4, chunk_seconds=60.0) == _key()
+    assert _key(compute_type="float32") != _key()
+    assert _key(num_workers=2) != _key()
+    assert _key(num_workers=2, chunk_seconds=60.0) != _key(num_workers=2)
+
+
+def test_incomplete_stage_is_not_recorded(tmp_path):
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    written = tmp_path / "short1.mp4"
+    runs: list = []
+
+    def _stage() -> list[str]:
+        runs.append(1)
+        written.write_bytes(b"short")
+        raise IncompleteStage("1 of 2 shorts not written", [str(written)])
+
+    outputs, _ = run_stage(manifest, "shorts", {"video": "fp"}, _stage)
+    assert outputs == [str(written)]
+    assert "shorts" not in manifest.stages
+
+    run_stage(manifest, "shorts", {"video": "fp"}, _stage)
+    assert len(runs) == 2
@@ -0,0 +1,83 @@
+import av
+import pytest
+
+from pipeline.shorts_creator import _same_aspect, create_shorts
+from pipeline.video_generator import _encode_ffmpeg_slideshow
+
+from .conftest import requires_ffmpeg
+
+
+def _frame_counts(paths: list[str]) -> list[int]:
+    counts = []
+    for path in paths:
+        with av.open(path) as container:
+            counts.append(sum(1 for _ in container.decode(video=0)))
+    return counts
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("single_decode", [True, False])
+def test_ffmpeg_shorts_from_vfr_source_have_full_frame_counts(tmp_path, audio_12s, small_stills, single_decode):
+    # stills change at 3 s and 7 s: every short but the first starts mid-still
+    source = _encode_ffmpeg_slideshow(
+        audio_12s, list(zip(small_stills, [3.0, 4.0, 5.0])), str(tmp_path / "vfr.mp4"), str(tmp_path),
+        preset="ultrafast", vfr=True,
+    )
+
+    shorts = create_shorts(
+        source, str(tmp_path / "shorts"), fps=10, preset="ultrafast", out_w=180, out_h=320,
+        mode="manual", manual_ranges=[(0, 5), (5, 10), (10, 12)], engine="ffmpeg", single_decode=single_decode,
+    )
+
+    assert _frame_counts(shorts) == [50, 50, 20]
+
+
+@requires_ffmpeg
+def test_ffmpeg_single_decode_groups_fall_back_per_short(tmp_path, audio_12s, small_stills, monkeypatch):
+    from pipeline import shorts_creator
+
+    source = _encode_ffmpeg_slideshow(
+        audio_12s, list(zip(small_stills, [3.0, 4.0, 5.0])), str(tmp_path / "cfr.mp4"), str(tmp_path),
+        preset="ultrafast",
+    )
+    render = shorts_creator._ffmpeg_render_single_decode
+    groups = []
+
+    def _flaky(video_path, graph, jobs, **kwargs):
+        groups.append([i for i, _, _, _ in jobs])
+        if len(groups) == 2:
+            raise RuntimeError("encoder crashed")
+        render(video_path, graph, jobs, **kwargs)
+
+    monkeypatch.setattr(shorts_creator, "SINGLE_DECODE_GROUP", 2)
+    monkeypatch.setattr(shorts_creator, "_ffmpeg_render_single_decode", _flaky)
+
+    shorts = create_shorts(
+        source, str(tmp_path / "shorts"), fps=10, preset="ultrafast", out_w=180, out_h=320,
+        mode="manual", manual_ranges=[(0, 3), (3, 6), (6, 9)], engine="ffmpeg", single_decode=True,
+    )
+
+    assert groups == [[1, 2], [3]]
+    assert _frame_counts(shorts) == [30, 30, 30]
+
+
+@pytest.mark.parametrize(
+    "size, vertical",
+    [((1080, 1920), True), ((720, 1280), True), ((1088, 1920), True), ((1920, 1080), False), ((1080, 1350), False)],
+)
+def test_same_aspect_allows_rounding(size, vertical):
+    assert _same_aspect(*size, 1080, 1920) is vertical
+
+
+def test_stream_copy_cuts_at_snapped_keyframes_even_when_aligned(tmp_path, monkeypatch):
+    from pipeline import shorts_creator
+
+    cmds = []
+    monkeypatch.setattr(shorts_creator, "run_ffmpeg", lambda cmd, what: cmds.append(cmd))
+    # keyframes 20 ms after each planned cut: within the alignment tolerance
+    jobs = [(1, 0.0, 10.0, str(tmp_path / "short1.mp4")), (2, 10.0, 20.0, str(tmp_path / "short2.mp4"))]
+
+    shorts_creator._create_shorts_copy("in.mp4", jobs, 20.0, [0.0, 10.02])
+
+    seeks = [float(cmd[cmd.index("-ss") + 1]) for cmd in cmds]
+    assert seeks == pytest.approx([0.001, 10.021])
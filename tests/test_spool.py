@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+
+from pipeline.spool import SpoolQueue, serve
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _box(queue: SpoolQueue, box: str) -> list[str]:
+    return sorted(os.listdir(os.path.join(queue.root, box)))
+
+
+def test_claim_records_pid_in_the_claimed_name(tmp_path):
+    queue = SpoolQueue(str(tmp_path))
+    job_id = queue.submit({"audio": "a.m4a"})
+
+    assert queue.claim() == (job_id, {"audio": "a.m4a"})
+    assert _box(queue, "running") == [f"{job_id}@{os.getpid()}.json"]
+    assert queue.status(job_id)["state"] == "running"
+    assert queue.claim() is None
+
+
+def test_finish_moves_spec_and_records_result(tmp_path):
+    queue = SpoolQueue(str(tmp_path))
+    ok_id = queue.submit({"n": 1}, job_id="a")
+    bad_id = queue.submit({"n": 2}, job_id="b")
+    queue.claim()
+    queue.claim()
+
+    queue.finish(ok_id, ok=True, result={"video": "out.mp4"})
+    queue.finish(bad_id, ok=False, error="boom")
+
+    assert _box(queue, "running") == []
+    assert _box(queue, "done") == ["a.json"] and _box(queue, "failed") == ["b.json"]
+    assert queue.status(ok_id)["result"] == {"video": "out.mp4"}
+    assert queue.status(bad_id)["state"] == "failed"
+
+
+def test_recover_requeues_only_jobs_of_dead_workers(tmp_path):
+    queue = SpoolQueue(str(tmp_path))
+    live = queue.submit({}, job_id="live")
+    orphan = queue.submit({}, job_id="orphan")
+    queue.claim()
+    queue.claim()
+    os.replace(queue._running_path(orphan), queue._running_path(orphan, _dead_pid()))
+    # the window between the claim rename and the status write: no pid in the status
+    os.remove(queue._path("status", live))
+
+    assert queue.recover() == 1
+    assert _box(queue, "incoming") == ["orphan.json"]
+    assert _box(queue, "running") == [f"live@{os.getpid()}.json"]
+    assert queue.status(orphan)["state"] == "queued"
+
+
+def test_serve_once_drains_the_queue(tmp_path):
+    queue = SpoolQueue(str(tmp_path))
+    queue.submit({"ok": True}, job_id="1")
+    queue.submit({"ok": False}, job_id="2")
+    stages = []
+
+    def handler(job_id, spec, progress):
+        progress("video")
+        stages.append(job_id)
+        if not spec["ok"]:
+            raise RuntimeError("render failed")
+        return {"shorts": []}
+
+    assert serve(queue, handler, concurrency=2, once=True, poll=0.01) == {"done": 1, "failed": 1}
+    assert sorted(stages) == ["1", "2"]
+    assert queue.status("2")["error"] == "render failed"
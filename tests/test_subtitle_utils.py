@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pipeline import subtitle_utils
+from pipeline.chunked_transcription import Chunk
+from pipeline.subtitle_utils import transcribe_audio_to_ass
+
+
+class _FakeModel:
+    def transcribe(self, audio, task, language):
+        return iter([]), SimpleNamespace(language="en")
+
+    def detect_language(self, audio):
+        return "en", 1.0
+
+
+@pytest.mark.parametrize(
+    "chunks, chunk_seconds, expected",
+    [
+        ([Chunk(0, 0.0, 12.0)], 600.0, (1, 0)),  # one chunk: sequential, library threads
+        ([], 0.0, (1, 0)),  # chunking off
+        ([Chunk(0, 0.0, 6.0), Chunk(1, 6.0, 12.0)], 600.0, (2, 4)),  # 2 chunks on 4 workers
+    ],
+)
+def test_threads_split_only_for_parallel_chunks(tmp_path, audio_12s, monkeypatch, chunks, chunk_seconds, expected):
+    loads = []
+    monkeypatch.setattr(subtitle_utils.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(subtitle_utils, "plan_audio_chunks", lambda path, workers, seconds: (np.zeros(16000 * 12, dtype=np.float32), chunks))
+    monkeypatch.setattr(
+        subtitle_utils, "_get_model",
+        lambda size, **kwargs: loads.append((kwargs["num_workers"], kwargs["cpu_threads"])) or _FakeModel(),
+    )
+
+    transcribe_audio_to_ass(
+        audio_12s, str(tmp_path / "subs.ass"), num_workers=4, chunk_seconds=chunk_seconds,
+    )
+
+    assert loads == [expected]
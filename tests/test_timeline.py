@@ -0,0 +1,58 @@
+import pytest
+
+from pipeline.subtitle_utils import _to_ass
+from pipeline.timeline import Interval, ass_event_times, build_timeline, segment_event_times
+
+
+def _covers(intervals, total) -> bool:
+    return (
+        intervals[0].start == 0.0
+        and intervals[-1].end == pytest.approx(total)
+        and all(a.end == b.start for a, b in zip(intervals, intervals[1:]))
+    )
+
+
+def test_build_timeline_splits_images_at_change_points():
+    # subtitle events inside image 0, on the 0/1 cut, inside image 1 and past the end
+    intervals = build_timeline([2.0, 3.0], [1.0, 2.0, 3.5, 0.0, 9.0, 1.0])
+    assert intervals == [
+        Interval(0.0, 1.0, 0),
+        Interval(1.0, 2.0, 0),
+        Interval(2.0, 3.5, 1),
+        Interval(3.5, 5.0, 1),
+    ]
+    assert _covers(intervals, 5.0)
+
+
+def test_build_timeline_without_change_points_is_one_interval_per_image():
+    intervals = build_timeline([1.5, 0.5, 2.0], [])
+    assert [(i.start, i.end, i.image) for i in intervals] == [(0.0, 1.5, 0), (1.5, 2.0, 1), (2.0, 4.0, 2)]
+    assert intervals[1].duration == pytest.approx(0.5)
+
+
+def test_build_timeline_skips_zero_length_images():
+    intervals = build_timeline([1.0, 0.0, 1.0], [0.5, 1.0, 1.5])
+    assert [i.image for i in intervals] == [0, 0, 2, 2]
+    assert _covers(intervals, 2.0)
+
+
+def test_build_timeline_many_points_per_image():
+    points = [i * 0.25 for i in range(1, 40)]
+    intervals = build_timeline([4.0, 6.0], points)
+    assert len(intervals) == 40
+    assert all(i.image == (0 if i.end <= 4.0 else 1) for i in intervals)
+    assert _covers(intervals, 10.0)
+
+
+def test_ass_event_times_matches_segment_times(tmp_path):
+    segments = [
+        {"start": 0.5, "end": 1.25, "text": "first, with a comma"},
+        {"start": 1.25, "end": 3.0, "text": "second"},
+        {"start": 3661.5, "end": 3662.0, "text": "after an hour"},
+    ]
+    ass = tmp_path / "subs.ass"
+    ass.write_text(_to_ass(segments) + "Dialogue: broken\n", encoding="utf-8")
+
+    times = ass_event_times(str(ass))
+    assert times == [0.5, 1.25, 3.0, 3661.5, 3662.0]
+    assert times == segment_event_times(segments)
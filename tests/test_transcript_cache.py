@@ -0,0 +1,76 @@
+import pytest
+
+from pipeline.transcript_cache import load_segments, save_segments, transcript_key, transcript_options
+
+BASE = {"device": "cpu", "compute_type": "int8", "cpu_threads": 0, "num_workers": 4, "chunk_seconds": 600.0}
+
+
+@pytest.fixture
+def audio(tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"audio")
+    return path
+
+
+def _key(audio, **overrides) -> str:
+    args = dict(model_size="base", task="transcribe", language=None, backend="faster", options=BASE)
+    args.update(overrides)
+    return transcript_key(str(audio), args.pop("model_size"), args.pop("task"), **args)
+
+
+def test_transcript_options_defaults_and_chunking():
+    assert transcript_options() == {"device": "auto", "compute_type": "int8", "chunking": None}
+    assert transcript_options("faster", BASE)["chunking"] == [4, 600.0]
+    # no chunking: sequential faster pass, chunking disabled, or the openai backend
+    assert transcript_options("faster", dict(BASE, num_workers=1))["chunking"] is None
+    assert transcript_options("faster", dict(BASE, chunk_seconds=0))["chunking"] is None
+    assert transcript_options("openai", BASE)["chunking"] is None
+
+
+def test_transcript_key_is_stable(audio, tmp_path):
+    key = _key(audio)
+    assert key == _key(audio, options=dict(BASE))
+    # speed-only options and the file's location do not matter
+    assert key == _key(audio, options=dict(BASE, cpu_threads=8))
+    copy = tmp_path / "copy.wav"
+    copy.write_bytes(audio.read_bytes())
+    assert key == _key(copy)
+    # None and the defaults they stand for are the same transcript
+    assert _key(audio, options=None) == _key(audio, options={"device": "auto", "compute_type": "int8"})
+    assert _key(audio, language=None) == _key(audio, language="")
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"model_size": "small"},
+        {"task": "translate"},
+        {"language": "hi"},
+        {"backend": "openai"},
+        {"options": dict(BASE, device="cuda")},
+        {"options": dict(BASE, compute_type="float32")},
+        {"options": dict(BASE, num_workers=2)},
+        {"options": dict(BASE, chunk_seconds=120.0)},
+        {"options": dict(BASE, num_workers=1)},
+    ],
+)
+def test_transcript_key_changes_with_each_option(audio, overrides):
+    assert _key(audio, **overrides) != _key(audio)
+
+
+def test_transcript_key_changes_with_audio_content(audio):
+    key = _key(audio)
+    audio.write_bytes(b"other audio")
+    assert _key(audio) != key
+
+
+def test_save_and_load_segments(tmp_path):
+    cache = str(tmp_path / "cache")
+    assert load_segments(cache, "k") is None
+
+    saved = save_segments(cache, "k", [{"start": 1, "end": 2.5, "text": None, "words": [{"start": 1, "end": 2}]}])
+    assert saved == [{"start": 1.0, "end": 2.5, "text": "", "words": [{"start": 1.0, "end": 2.0, "word": ""}]}]
+    assert load_segments(cache, "k") == saved
+
+    (tmp_path / "cache" / "k.json").write_text("{", encoding="utf-8")
+    assert load_segments(cache, "k") is None
@@ -0,0 +1,46 @@
+from concurrent.futures import Future
+
+import pytest
+
+from pipeline.ffmpeg_utils import probe_media
+from pipeline.frame_cache import FrameCache
+from pipeline.image_utils import SlideshowFrames
+from pipeline.video_generator import _encode_ffmpeg_slideshow, _warm_frame_cache
+
+from .conftest import requires_ffmpeg
+
+
+def _stream_durations(path: str) -> dict:
+    return {s["codec_type"]: float(s["duration"]) for s in probe_media(path)["streams"]}
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("vfr", [False, True])
+def test_slideshow_video_lasts_as_long_as_audio(tmp_path, audio_12s, small_stills, vfr):
+    stills = list(zip(small_stills, [3.0, 4.0, 5.0]))
+    out = _encode_ffmpeg_slideshow(
+        audio_12s, stills, str(tmp_path / "out.mp4"), str(tmp_path), preset="ultrafast", vfr=vfr,
+    )
+
+    durations = _stream_durations(out)
+    assert durations["audio"] == pytest.approx(12.0, abs=0.05)
+    assert durations["video"] == pytest.approx(durations["audio"], abs=0.05)
+
+
+def test_warm_frame_cache_fills_cache_while_transcribing(tmp_path, small_stills):
+    cache = FrameCache(str(tmp_path / "frames"))
+    transcribing = Future()
+    assert _warm_frame_cache(small_stills, (64, 36), workers=1, cache=cache, until=transcribing) == 3
+
+    frames = SlideshowFrames(small_stills, 1.0, size=(64, 36), prefetch=0, cache=cache)
+    for t in (0.0, 1.0, 2.0):
+        frames(t)
+    frames.close()
+    assert cache.hits == 3
+
+
+def test_warm_frame_cache_stops_when_transcription_is_done(tmp_path, small_stills):
+    cache = FrameCache(str(tmp_path / "frames"))
+    done = Future()
+    done.set_result("subs.ass")
+    assert _warm_frame_cache(small_stills, (64, 36), workers=1, cache=cache, until=done) == 1
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import hashlib
+
+_CHUNK = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """
+    Hex sha256 of a file's contents (streamed, so large media files are fine).
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def text_sha256(*parts) -> str:
+    """
+    Hex sha256 of the given parts joined with '|' (used to build cache keys).
+    """
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+
+
+def write_json_atomic(path: str, data, **dump_kwargs) -> None:
+    """
+    Write data as JSON to a temp file next to path, then rename it over path, so readers
+    never see a partial file. dump_kwargs go to json.dump (default: indent=2, UTF-8
+    text kept as is, non-JSON values via str). Raises on failure; the temp file is
+    always removed.
+    """
+    dump_kwargs = {"indent": 2, "ensure_ascii": False, "default": str, **dump_kwargs}
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime
+
+from utils.hashing import text_sha256
+from utils.jsonio import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the manifest layout changes (older manifests are then ignored)
+_FORMAT_VERSION = 1
+
+
+def fingerprint(inputs: dict) -> str:
+    """
+    Stable hash of a stage's inputs: file hashes and parameters, as plain JSON values.
+    """
+    return text_sha256(f"v{_FORMAT_VERSION}", json.dumps(inputs, sort_keys=True, default=str))
+
+
+class BuildManifest:
+    """
+    JSON record of what each pipeline stage last produced:
+    {stage: {"fingerprint": ..., "outputs": [...], "inputs": {...}, "at": ...}}.
+
+    A stage is fresh when its fingerprint is unchanged and all recorded outputs still
+    exist. Invalidating a stage deletes exactly the outputs it recorded.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stages: dict[str, dict] = {}
+        self.loaded = False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            logger.warning("Build manifest unreadable, ignoring: %s", path, exc_info=True)
+            return
+
+        if data.get("version") != _FORMAT_VERSION:
+            logger.info("Build manifest version %s != %s, ignoring: %s", data.get("version"), _FORMAT_VERSION, path)
+            return
+        self.stages = data.get("stages") or {}
+        self.loaded = True
+
+    def outputs(self, stage: str) -> list[str]:
+        return list(self.stages.get(stage, {}).get("outputs") or [])
+
+    def is_fresh(self, stage: str, fp: str) -> bool:
+        entry = self.stages.get(stage)
+        if not entry or entry.get("fingerprint") != fp:
+            return False
+        missing = [p for p in entry.get("outputs") or [] if not os.path.exists(p)]
+        if missing:
+            logger.info("Stage %s outputs missing: %s", stage, missing)
+            return False
+        return True
+
+    def record(self, stage: str, fp: str, outputs: list[str], inputs: dict | None = None) -> None:
+        self.stages[stage] = {
+            "fingerprint": fp,
+            "outputs": list(outputs),
+            "inputs": inputs or {},
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def invalidate(self, stage: str) -> list[str]:
+        """
+        Delete the stage's recorded outputs and forget it. Returns the deleted paths.
+        """
+        entry = self.stages.pop(stage, None)
+        removed = []
+        for p in (entry or {}).get("outputs") or []:
+            try:
+                os.remove(p)
+                removed.append(p)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                logger.exception("Failed to delete stale output: %s", p)
+        if entry is not None:
+            logger.info("Invalidated stage %s removed=%d", stage, len(removed))
+            self.save()
+        return removed
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        write_json_atomic(self.path, {"version": _FORMAT_VERSION, "stages": self.stages}, sort_keys=True)
+        self.loaded = True
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+
+
+def safe_mp_context():
+    """
+    Process start method that is safe while other threads are running (e.g. a background
+    transcription): forking a threaded process can deadlock on locks held by other threads.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def init_worker_logging(level: int) -> None:
+    """
+    ProcessPoolExecutor initializer: spawned workers start with unconfigured logging,
+    so mirror the parent's level on a console handler (file handlers stay in the parent).
+    """
+    from utils.logger import setup_logging
+
+    setup_logging(level=logging.getLevelName(level))
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.jsonio import write_json_atomic
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+# ru_maxrss is KiB on Linux, bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Report collecting the stages of the current run (per thread of control: worker jobs
+# running side by side each see their own report)
+_REPORT: contextvars.ContextVar["RunReport | None"] = contextvars.ContextVar("run_report", default=None)
+
+
+def _now() -> str:
+    return datetime.now().strftime("%H:%M:%S.%f")[:-3]
+
+
+def _rusage(who) -> tuple[float, int, int]:
+    """
+    (cpu seconds, max RSS bytes, output blocks) for RUSAGE_SELF/RUSAGE_CHILDREN.
+    """
+    if resource is None:
+        return 0.0, 0, 0
+    ru = resource.getrusage(who)
+    return ru.ru_utime + ru.ru_stime, ru.ru_maxrss * _MAXRSS_UNIT, ru.ru_oublock
+
+
+def _current_rss() -> int:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return _rusage(resource.RUSAGE_SELF)[1] if resource else 0
+
+
+def _counters() -> dict:
+    """
+    Process-wide counters a stage is measured against. CPU and written blocks include
+    finished (reaped) child processes such as ffmpeg and pool workers.
+    """
+    if resource is None:
+        return {
+            "wall": time.perf_counter(),
+            "cpu": time.process_time(),
+            "thread_cpu": time.thread_time(),
+            "oublock": 0,
+        }
+    self_cpu, _, self_out = _rusage(resource.RUSAGE_SELF)
+    child_cpu, _, child_out = _rusage(resource.RUSAGE_CHILDREN)
+    return {
+        "wall": time.perf_counter(),
+        "cpu": self_cpu + child_cpu,
+        "thread_cpu": time.thread_time(),
+        "oublock": self_out + child_out,
+    }
+
+
+class RunReport:
+    """
+    Collects one record per stage() run while active, samples RSS in the background
+    (so each stage gets its own peak), and writes a JSON report on exit:
+
+        with RunReport("output/run_report.json", meta={...}) as report:
+            ...  # every `with stage(...)` in this context is recorded
+
+    Stage CPU and bytes written are process-wide deltas over the stage's window
+    (including finished child processes), so stages that overlap in time (e.g.
+    transcription on its own thread) share the CPU spent during the overlap;
+    thread_cpu_s is the stage thread's own CPU. bytes_written comes from
+    block-output counters (512-byte units), i.e. data handed to the filesystem.
+    """
+
+    def __init__(self, path: str | None, meta: dict | None = None, sample_interval: float = 0.05):
+        self.path = path
+        self.meta = dict(meta or {})
+        self.stages: list[dict] = []
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._active: list[dict] = []
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._token = None
+        self._t0 = None
+        self._epoch = None
+        self._start = None
+        self.data: dict = {}
+
+    # --- stage bookkeeping (called by stage()) ---
+    def _enter(self, rec: dict) -> None:
+        rec["peak_rss"] = _current_rss()
+        with self._lock:
+            self._active.append(rec)
+
+    def _exit(self, rec: dict) -> None:
+        rec["peak_rss"] = max(rec["peak_rss"], _current_rss())
+        with self._lock:
+            if rec in self._active:
+                self._active.remove(rec)
+            self.stages.append(rec)
+
+    def add(self, rec: dict) -> None:
+        """
+        Add a record measured elsewhere (e.g. returned by a pool worker process).
+        """
+        rec = dict(rec, start_s=round(rec.get("at", self._epoch) - self._epoch, 3))
+        with self._lock:
+            self.stages.append(rec)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.sample_interval):
+            rss = _current_rss()
+            with self._lock:
+                for rec in self._active:
+                    if rss > rec["peak_rss"]:
+                        rec["peak_rss"] = rss
+
+    # --- lifecycle ---
+    def __enter__(self) -> "RunReport":
+        self._start = _counters()
+        self._t0 = self._start["wall"]
+        self._epoch = time.time()
+        self.data["started"] = datetime.now().isoformat(timespec="seconds")
+        self._token = _REPORT.set(self)
+        self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        _REPORT.reset(self._token)
+
+        end = _counters()
+        self_peak = _rusage(resource.RUSAGE_SELF)[1] if resource else 0
+        child_peak = _rusage(resource.RUSAGE_CHILDREN)[1] if resource else 0
+
+        # per stage kind: short1, short2, ... add up under "short"
+        totals: dict = {}
+        for rec in self.stages:
+            kind = rec["name"].rstrip("0123456789") or rec["name"]
+            t = totals.setdefault(kind, {"count": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            t["count"] += 1
+            t["wall_s"] = round(t["wall_s"] + rec["wall_s"], 3)
+            t["cpu_s"] = round(t["cpu_s"] + rec["cpu_s"], 3)
+
+        self.data.update(
+            finished=datetime.now().isoformat(timespec="seconds"),
+            ok=exc_type is None,
+            error=str(exc) if exc is not None else None,
+            wall_s=round(end["wall"] - self._t0, 3),
+            cpu_s=round(end["cpu"] - self._start["cpu"], 3),
+            peak_rss_mb=round(self_peak / _MB, 1),
+            peak_child_rss_mb=round(child_peak / _MB, 1),
+            bytes_written=(end["oublock"] - self._start["oublock"]) * 512,
+            host={
+                "cpu_count": os.cpu_count(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+            },
+            meta=self.meta,
+            stages=sorted(self.stages, key=lambda r: r["start_s"]),
+            totals=totals,
+        )
+        logger.info(
+            "Run report wall=%.2fs cpu=%.2fs peak_rss=%.0fMB peak_child_rss=%.0fMB written=%.1fMB stages=%d",
+            self.data["wall_s"], self.data["cpu_s"], self.data["peak_rss_mb"], self.data["peak_child_rss_mb"],
+            self.data["bytes_written"] / _MB, len(self.stages),
+        )
+        if self.path:
+            self.write(self.path)
+
+    def write(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        try:
+            write_json_atomic(path, self.data)
+            logger.info("Run report saved: %s", path)
+        except Exception:
+            logger.warning("Run report write failed: %s", path, exc_info=True)
+
+
+def current_report() -> RunReport | None:
+    return _REPORT.get()
+
+
+def propagate(fn):
+    """
+    Bind fn to the caller's context (active RunReport included) for executor.submit;
+    threads otherwise start with an empty context.
+    """
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, fn)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Log wall-clock start/end of a pipeline stage (with thread name, so
+    stages running concurrently are visible as overlapping in the log), and
+    measure wall/CPU time, peak RSS and bytes written. Yields the record dict,
+    which is added to the active RunReport, if any.
+    """
+    thread = threading.current_thread().name
+    report = _REPORT.get()
+    start = _counters()
+    rec = {
+        "name": name,
+        "thread": thread,
+        "pid": os.getpid(),
+        "at": time.time(),
+        "start_s": round(start["wall"] - report._t0, 3) if report else 0.0,
+    }
+    if report:
+        report._enter(rec)
+
+    logger.info("Stage start name=%s at=%s thread=%s", name, _now(), thread)
+    ok = False
+    try:
+        yield rec
+        ok = True
+    finally:
+        end = _counters()
+        rec.update(
+            ok=ok,
+            wall_s=round(end["wall"] - start["wall"], 3),
+            cpu_s=round(end["cpu"] - start["cpu"], 3),
+            thread_cpu_s=round(end["thread_cpu"] - start["thread_cpu"], 3),
+            bytes_written=(end["oublock"] - start["oublock"]) * 512,
+        )
+        if report:
+            report._exit(rec)
+        else:
+            # no sampler running: lifetime peak of this process
+            rec["peak_rss"] = _rusage(resource.RUSAGE_SELF)[1] if resource else _current_rss()
+        rec["peak_rss_mb"] = round(rec.pop("peak_rss") / _MB, 1)
+
+        logger.info(
+            "Stage %s name=%s at=%s elapsed=%.2fs cpu=%.2fs peak_rss=%.0fMB written=%.1fMB",
+            "end" if ok else "failed", name, _now(), rec["wall_s"], rec["cpu_s"],
+            rec["peak_rss_mb"], rec["bytes_written"] / _MB,
+        )
+
+
+def profiled(name: str | None = None):
+    """
+    Decorator form of stage(): profile every call of the function.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name or fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco